@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+HTML Extraction Benchmark
+
+Times skills.sh page extraction on saved pages, comparing the old approach
+(html.parser + regex over soup.get_text()) with crawl_skills_sh's current
+extraction on every available parser backend, and checks they agree.
+
+Pages live in scripts/fixtures/: skills_sh_home.html (homepage listing) and
+skills_sh_skill.html (a skill page). Save fresh copies there to benchmark
+against the live markup.
+
+Usage:
+    python bench_html_extract.py [--iterations 20] [--home page.html] [--skill page.html]
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+import html_extract
+from crawl_skills_sh import extract_skills_from_homepage, parse_install_count, parse_skill_page
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def legacy_skill_page(html: str) -> dict:
+    """Skill page details the way the crawler used to read them: meta tags plus a full-text scan"""
+    soup = BeautifulSoup(html, "html.parser")
+    result = {"description": "", "installs": 0}
+    for selector in ["meta[property='og:description']", "meta[name='description']"]:
+        meta = soup.select_one(selector)
+        if meta and meta.get("content"):
+            result["description"] = meta["content"]
+            break
+    match = re.search(r'(\d+(?:\.\d+)?[KkMm]?)\s*(?:install|download|use)', soup.get_text())
+    if match:
+        result["installs"] = parse_install_count(match.group(1))
+    return result
+
+
+def time_it(func, arg, iterations: int) -> tuple[float, object]:
+    """Mean milliseconds per call, plus the last result"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func(arg)
+    return (time.perf_counter() - start) * 1000 / iterations, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skills.sh HTML extraction backends")
+    parser.add_argument("--iterations", "-n", type=int, default=20,
+                       help="Runs per measurement")
+    parser.add_argument("--home", default=str(FIXTURES_DIR / "skills_sh_home.html"),
+                       help="Saved skills.sh homepage")
+    parser.add_argument("--skill", default=str(FIXTURES_DIR / "skills_sh_skill.html"),
+                       help="Saved skills.sh skill page")
+    args = parser.parse_args()
+
+    home_html = Path(args.home).read_text(encoding="utf-8")
+    skill_html = Path(args.skill).read_text(encoding="utf-8")
+
+    print("=" * 60)
+    print("HTML Extraction Benchmark")
+    print("=" * 60)
+    print(f"  Homepage: {len(home_html) / 1024:.0f} KB, skill page: {len(skill_html) / 1024:.0f} KB")
+    print(f"  Iterations: {args.iterations}")
+
+    baseline_ms, baseline_details = time_it(legacy_skill_page, skill_html, args.iterations)
+    print(f"\n  Skill page description + install count")
+    print(f"    legacy (html.parser + get_text): {baseline_ms:8.2f} ms")
+
+    for backend in html_extract.available_parsers():
+        html_extract.select_parser(backend)
+        ms, details = time_it(parse_skill_page, skill_html, args.iterations)
+        match = "ok" if details == baseline_details else "MISMATCH"
+        print(f"    {backend:<31}: {ms:8.2f} ms  ({baseline_ms / ms:.1f}x, fields {match})")
+
+    html_extract.select_parser("html.parser")
+    baseline_ms, baseline_links = time_it(extract_skills_from_homepage, home_html, args.iterations)
+    print(f"\n  Homepage link extraction ({len(baseline_links)} skills)")
+    print(f"    {'html.parser':<31}: {baseline_ms:8.2f} ms")
+
+    for backend in html_extract.available_parsers():
+        if backend == "html.parser":
+            continue
+        html_extract.select_parser(backend)
+        ms, links = time_it(extract_skills_from_homepage, home_html, args.iterations)
+        match = "ok" if links == baseline_links else "MISMATCH"
+        print(f"    {backend:<31}: {ms:8.2f} ms  ({baseline_ms / ms:.1f}x, links {match})")
+
+
+if __name__ == "__main__":
+    main()
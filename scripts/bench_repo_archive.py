@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Repo Archive Benchmark
+
+Measures what archive mode saves when harvesting SKILL.md files: one tarball
+download versus one raw request per skill. Runs against a local HTTP server
+standing in for raw.githubusercontent.com and codeload.github.com, with a
+configurable per-request latency to model the round trip.
+
+By default a synthetic plugin-style repo is generated; pass --archive to use
+a saved GitHub tarball instead.
+
+Usage:
+    python bench_repo_archive.py [--skills 40] [--latency 80]
+    python bench_repo_archive.py --archive skills-main.tar.gz
+"""
+
+import argparse
+import io
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import http_client
+import rate_limit
+import repo_archive
+
+
+def build_archive(skill_count: int, body_size: int) -> bytes:
+    """A gzipped tarball shaped like GitHub's, with plugins/*/skills/*/SKILL.md files"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for i in range(skill_count):
+            for name, text in [
+                (f"plugins/plugin-{i}/skills/skill-{i}/SKILL.md",
+                 f"---\nname: skill-{i}\ndescription: Skill {i}\n---\n" + "x" * body_size),
+                (f"plugins/plugin-{i}/skills/skill-{i}/reference.md", "y" * body_size * 4),
+            ]:
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(f"repo-main/{name}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def serve(archive: bytes, files: dict[str, str], latency: float) -> ThreadingHTTPServer:
+    """Serve /archive.tar.gz and /raw/{path} with a fixed delay per request"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests_served = 0
+
+        def do_GET(self):
+            Handler.requests_served += 1
+            time.sleep(latency)
+            if self.path == "/archive.tar.gz":
+                body = archive
+            else:
+                body = files.get(self.path[len("/raw/"):], "").encode("utf-8")
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.handler = Handler
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark archive vs per-file SKILL.md harvesting")
+    parser.add_argument("--skills", "-n", type=int, default=40,
+                       help="Skills in the synthetic repo")
+    parser.add_argument("--body-size", type=int, default=4000,
+                       help="Bytes per synthetic SKILL.md")
+    parser.add_argument("--latency", type=float, default=80,
+                       help="Simulated round trip per request, in ms")
+    parser.add_argument("--archive", "-a", default=None,
+                       help="Saved .tar.gz to use instead of a synthetic repo")
+    args = parser.parse_args()
+
+    if args.archive:
+        with open(args.archive, "rb") as f:
+            archive = f.read()
+    else:
+        archive = build_archive(args.skills, args.body_size)
+    files = dict(repo_archive.iter_skill_mds(io.BytesIO(archive)))
+
+    server = serve(archive, files, args.latency / 1000)
+    base = f"http://127.0.0.1:{server.server_port}"
+    rate_limit.configure_host("127.0.0.1", rate=10000, burst=10000)  # Measure transfer, not throttling
+
+    print("=" * 60)
+    print("Repo Archive Benchmark")
+    print("=" * 60)
+    print(f"  SKILL.md files: {len(files)}, archive: {len(archive) / 1024:.0f} KB, latency: {args.latency:.0f} ms")
+
+    start = time.perf_counter()
+    per_file = {path: http_client.get(f"{base}/raw/{path}").text for path in files}
+    per_file_s = time.perf_counter() - start
+    per_file_requests = server.handler.requests_served
+
+    start = time.perf_counter()
+    from_archive = repo_archive.fetch_skill_mds("", "", "", url=f"{base}/archive.tar.gz")
+    archive_s = time.perf_counter() - start
+    archive_requests = server.handler.requests_served - per_file_requests
+
+    print(f"\n  Per-file raw requests: {per_file_requests:5d} requests  {per_file_s * 1000:8.0f} ms")
+    print(f"  Archive download:      {archive_requests:5d} requests  {archive_s * 1000:8.0f} ms")
+    print(f"\n  Saved {per_file_requests - archive_requests} requests, {per_file_s / archive_s:.1f}x faster")
+    print(f"  Contents match: {'yes' if from_archive == per_file else 'NO'}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
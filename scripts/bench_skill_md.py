@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SKILL.md Parser Benchmark
+
+Times SKILL.md frontmatter parsing the way the crawler and validator used
+to do it (pure-Python yaml.safe_load on every file) against skill_md.parse_skill_md,
+cold and with a warm memo, and checks both give the same metadata.
+
+Bodies come from a crawl output's skill_md_content (--input). Without one,
+SKILL.md files are built from the bundled registry in web/data, using
+the frontmatter shapes seen in the wild: flat key: value, quoted
+descriptions, and metadata blocks.
+
+Usage:
+    python bench_skill_md.py [--input skills_sh_crawled.jsonl] [--iterations 3]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import yaml
+
+import skill_md
+from jsonl_io import read_records
+
+
+REGISTRY_PATH = Path(__file__).parent.parent / "web" / "data" / "agenticskills-registry-part-1.json"
+
+
+def legacy_parse(content: str) -> dict:
+    """SKILL.md metadata the way validate_github_skill used to read it"""
+    result = {"name": "", "description": "", "version": "1.0.0", "license": "", "author": ""}
+    if not content.startswith("---"):
+        return result
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return result
+    try:
+        frontmatter = yaml.safe_load(parts[1])
+    except yaml.YAMLError:
+        return result
+    if isinstance(frontmatter, dict):
+        result["name"] = frontmatter.get("name", "")
+        result["description"] = frontmatter.get("description", "")
+        result["version"] = frontmatter.get("version", "1.0.0")
+        result["license"] = frontmatter.get("license", "")
+        author = frontmatter.get("author")
+        if isinstance(author, dict):
+            result["author"] = author.get("name", "")
+        elif author:
+            result["author"] = str(author)
+    return result
+
+
+def synthesize_skill_md(record: dict, index: int) -> str:
+    """A SKILL.md for a registry record, cycling through common frontmatter shapes"""
+    name = record.get("slug") or record.get("name", "")
+    description = record.get("short_description", "")
+    body = f"\n# {record.get('name', name)}\n\n{description}\n\n" + "Instructions for the agent.\n" * 40
+    shape = index % 3
+    if shape == 0:
+        frontmatter = f"name: {name}\ndescription: {description}\nlicense: MIT\n"
+    elif shape == 1:
+        frontmatter = (f"name: {name}\ndescription: {json.dumps(description)}\n"
+                       f"version: {record.get('version', '1.0.0')}\nauthor: {record.get('author', '')}\n")
+    else:
+        tags = ", ".join(json.dumps(t) for t in record.get("tags") or [])
+        frontmatter = (f"name: {name}\ndescription: {json.dumps(description)}\nkeywords: [{tags}]\n"
+                       f"metadata:\n  author: {record.get('author', '')}\n  version: \"{record.get('version', '1.0.0')}\"\n")
+    return f"---\n{frontmatter}---\n{body}"
+
+
+def load_bodies(input_path: str = None) -> list[str]:
+    if input_path:
+        return [r["skill_md_content"] for r in read_records(input_path) if r.get("skill_md_content")]
+    with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
+        records = json.load(f)["skills"]
+    return [synthesize_skill_md(record, i) for i, record in enumerate(records)]
+
+
+def time_pass(func, bodies: list[str]) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [func(body) for body in bodies]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SKILL.md frontmatter parsing")
+    parser.add_argument("--input", "-i", default=None,
+                       help="Crawl output with skill_md_content (default: bodies built from the bundled registry)")
+    parser.add_argument("--iterations", "-n", type=int, default=3,
+                       help="Passes over the bodies per measurement (best one is reported)")
+    args = parser.parse_args()
+
+    bodies = load_bodies(args.input)
+    unique = len(set(bodies))
+    fast_path = sum(
+        1 for body in bodies
+        if (text := skill_md.split_frontmatter(body)) is not None and skill_md.parse_simple_frontmatter(text) is not None
+    )
+
+    print("=" * 60)
+    print("SKILL.md Parser Benchmark")
+    print("=" * 60)
+    print(f"  Files: {len(bodies)} ({unique} unique), fast-path eligible: {fast_path}")
+    print(f"  YAML loader: {skill_md.YAML_LOADER.__name__}")
+
+    def best(func, reset=None) -> tuple[float, list]:
+        runs = []
+        for _ in range(args.iterations):
+            if reset:
+                reset()
+            runs.append(time_pass(func, bodies))
+        return min(runs, key=lambda run: run[0])
+
+    legacy_s, legacy_results = best(legacy_parse)
+    uncached_s, _ = best(skill_md.parse_uncached)
+    cold_s, results = best(skill_md.parse_skill_md, reset=skill_md.clear_memo)
+    warm_s, _ = best(skill_md.parse_skill_md)
+
+    rate = lambda seconds: f"{len(bodies) / seconds:10.0f} files/s"
+    print(f"\n  legacy yaml.safe_load:     {legacy_s * 1000:8.1f} ms  {rate(legacy_s)}")
+    print(f"  skill_md (no memo):        {uncached_s * 1000:8.1f} ms  {rate(uncached_s)}  ({legacy_s / uncached_s:.1f}x)")
+    print(f"  skill_md (cold memo):      {cold_s * 1000:8.1f} ms  {rate(cold_s)}  ({legacy_s / cold_s:.1f}x)")
+    print(f"  skill_md (warm memo):      {warm_s * 1000:8.1f} ms  {rate(warm_s)}  ({legacy_s / warm_s:.1f}x)")
+
+    # The legacy parser ignores metadata.author, so only compare authors it found
+    mismatches = sum(
+        1 for old, new in zip(legacy_results, results)
+        if (old["name"] or "", old["description"] or "", old["license"] or "")
+        != (new.name, new.description, new.license)
+        or (old["author"] and old["author"] != new.author)
+    )
+    print(f"\n  name/description/license/author agree with legacy: "
+          f"{'yes' if not mismatches else f'NO ({mismatches} differ)'}")
+
+
+if __name__ == "__main__":
+    main()
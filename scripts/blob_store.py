@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+SKILL.md Blob Store
+
+Content-addressed store for SKILL.md bodies, so pipeline artifacts carry a
+SHA-256 reference instead of the full text inline. Identical bodies (forks,
+vendored copies) are stored once, every body is zlib-compressed, and a stage
+loads a body only when it actually needs it.
+
+Layout follows git's object store: {root}/{sha[:2]}/{sha[2:]}, written
+atomically, so several processes (e.g. reparse workers) can share a store.
+
+A record with its body moved out looks like:
+    {"skill_md_sha256": "9f86d0...", ...}     # no skill_md_content key
+
+Usage:
+    from blob_store import BlobStore, externalize, load_content
+
+    store = BlobStore("skill_md_blobs")
+    record = externalize(record, store)        # content -> store, ref on the record
+    text = load_content(record, store)         # inline content or the stored body
+"""
+
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_ROOT = "skill_md_blobs"
+CONTENT_FIELD = "skill_md_content"
+REF_FIELD = "skill_md_sha256"
+
+
+def content_sha256(text: str) -> str:
+    """SHA-256 of a SKILL.md body, the key it is stored under"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """Compressed SKILL.md bodies in a directory, keyed by SHA-256"""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.added = 0
+        self.deduplicated = 0
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, text: str) -> str:
+        """Store a body (once per distinct content) and return its digest"""
+        digest = content_sha256(text)
+        target = self.path(digest)
+        if target.exists():
+            self.deduplicated += 1
+            return digest
+        target.parent.mkdir(exist_ok=True)
+        tmp = target.with_name(f".tmp-{os.getpid()}-{target.name}")
+        tmp.write_bytes(zlib.compress(text.encode("utf-8")))
+        os.replace(tmp, target)
+        self.added += 1
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """The body stored under digest, or None if it is missing"""
+        try:
+            data = self.path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+        return zlib.decompress(data).decode("utf-8")
+
+    def stats(self) -> dict:
+        """Bodies written and deduplicated by this instance, plus the store's size on disk"""
+        blobs = [p for p in self.root.glob("??/*") if not p.name.startswith(".tmp-")]
+        return {
+            "added": self.added,
+            "deduplicated": self.deduplicated,
+            "blobs": len(blobs),
+            "bytes": sum(p.stat().st_size for p in blobs),
+        }
+
+
+def externalize(record: dict, store: BlobStore) -> dict:
+    """Move a record's inline SKILL.md body into the store, leaving a reference"""
+    content = record.pop(CONTENT_FIELD, None)
+    if content:
+        record[REF_FIELD] = store.put(content)
+    return record
+
+
+def load_content(record: dict, store: Optional[BlobStore]) -> str:
+    """A record's SKILL.md body: inline if present, else from the store ("" if unavailable)"""
+    content = record.get(CONTENT_FIELD)
+    if content or not record.get(REF_FIELD) or store is None:
+        return content or ""
+    return store.get(record[REF_FIELD]) or ""
+
+
+def inline(record: dict, store: Optional[BlobStore]) -> dict:
+    """Put a referenced body back inline (the inverse of externalize)"""
+    if record.get(REF_FIELD) and not record.get(CONTENT_FIELD) and store is not None:
+        content = store.get(record[REF_FIELD])
+        if content is not None:
+            record[CONTENT_FIELD] = content
+            del record[REF_FIELD]
+    return record
+
+
+def has_content(record: dict) -> bool:
+    """Whether a record has a SKILL.md body, inline or by reference"""
+    return bool(record.get(CONTENT_FIELD) or record.get(REF_FIELD))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Default Branch Cache
+
+Persisted (owner, repo) -> default branch map, so raw.githubusercontent.com
+URLs are built for the branch a repo actually uses instead of probing main
+and then master for every candidate path. Master-only repos no longer pay
+for a failed main probe, and repos on other branch names (trunk, develop,
+v2, ...) are found at all.
+
+A branch is resolved once per repo, first from the git smart-HTTP ref
+advertisement (github.com/{owner}/{repo}.git/info/refs, which names HEAD's
+target and does not count against the API rate limit), then from the repos
+API as a fallback. Entries expire after a TTL so renamed default branches are
+picked up again. A repo whose branch can't be resolved is remembered in
+memory for a few minutes, so repeated lookups don't repeat both requests.
+
+Usage:
+    import branch_cache
+
+    branch_cache.enable("branch_cache.sqlite")
+    branch = branch_cache.default_branch("expo", "skills")       # "main"
+    for branch in branch_cache.candidate_branches(owner, repo):  # [branch] or ["main", "master"]
+        ...
+    branch_cache.disable()
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import requests
+
+import http_cache
+import http_client
+from ttl_cache import TTLCache
+
+
+GITHUB_API_BASE = "https://api.github.com"
+DEFAULT_DB = "branch_cache.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600  # Re-resolve a repo's default branch after a week
+UNRESOLVED_TTL = 10 * 60  # Retry a repo whose branch could not be resolved after this long
+UNRESOLVED = ""  # In-memory marker for a failed resolution
+FALLBACK_BRANCHES = ["main", "master"]
+REF_ADVERTISEMENT_BYTES = 4096  # HEAD's symref is in the first pkt-line
+
+SYMREF_PATTERN = re.compile(rb"symref=HEAD:refs/heads/([^\s\x00]+)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS default_branches (
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    resolved_at REAL NOT NULL,
+    PRIMARY KEY (owner, repo)
+)
+"""
+
+
+def fetch_branch_from_refs(owner: str, repo: str) -> Optional[str]:
+    """Default branch from the git ref advertisement, without using the API"""
+    url = f"https://github.com/{owner}/{repo}.git/info/refs?service=git-upload-pack"
+    try:
+        response = http_client.get(url, stream=True)
+        with response:
+            if response.status_code != 200:
+                return None
+            head = response.raw.read(REF_ADVERTISEMENT_BYTES, decode_content=True)
+    except (requests.RequestException, OSError):
+        return None
+    match = SYMREF_PATTERN.search(head)
+    return match.group(1).decode("utf-8", errors="replace") if match else None
+
+
+def fetch_branch_from_api(owner: str, repo: str) -> Optional[str]:
+    """Default branch from the repo metadata endpoint"""
+    try:
+        response = http_cache.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}",
+                                  headers={"Accept": "application/vnd.github+json"})
+        if response.status_code != 200:
+            return None
+        return response.json().get("default_branch")
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def resolve_default_branch(owner: str, repo: str) -> Optional[str]:
+    """Ask GitHub for a repo's default branch (None if the repo can't be read)"""
+    return fetch_branch_from_refs(owner, repo) or fetch_branch_from_api(owner, repo)
+
+
+class BranchCache:
+    """Default branches in memory (LRU, same TTL), optionally backed by a SQLite file"""
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL, max_memory: int = None,
+                 unresolved_ttl: float = UNRESOLVED_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.unresolved_ttl = unresolved_ttl
+        self._memory = TTLCache(maxsize=max_memory, ttl=ttl)
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+            self._db.execute("DELETE FROM default_branches WHERE resolved_at < ?", (time.time() - ttl,))
+            self._db.commit()
+
+    def cached(self, owner: str, repo: str) -> Optional[str]:
+        """Stored branch for owner/repo if still fresh, without any network call"""
+        key = (owner.lower(), repo.lower())
+        branch = self._memory.get(key)
+        if branch:
+            return branch
+        if self._db is None:
+            return None
+        with self._guard:
+            row = self._db.execute(
+                "SELECT branch FROM default_branches WHERE owner = ? AND repo = ? AND resolved_at >= ?",
+                (key[0], key[1], time.time() - self.ttl)
+            ).fetchone()
+        if row:
+            self._memory.set(key, row[0])
+            return row[0]
+        return None
+
+    def store(self, owner: str, repo: str, branch: str) -> None:
+        key = (owner.lower(), repo.lower())
+        self._memory.set(key, branch)
+        if self._db is None:
+            return
+        with self._guard:
+            self._db.execute(
+                "INSERT OR REPLACE INTO default_branches VALUES (?, ?, ?, ?)",
+                (key[0], key[1], branch, time.time())
+            )
+            self._db.commit()
+
+    def unresolved(self, owner: str, repo: str) -> bool:
+        """Whether resolving owner/repo failed within the last unresolved_ttl seconds"""
+        return self._memory.get((owner.lower(), repo.lower())) == UNRESOLVED
+
+    def get(self, owner: str, repo: str) -> Optional[str]:
+        """Default branch for owner/repo, resolving it at most once per TTL"""
+        if self.unresolved(owner, repo):
+            return None
+        branch = self.cached(owner, repo)
+        if branch:
+            return branch
+        key = (owner.lower(), repo.lower())
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            branch = self.cached(owner, repo)
+            if not branch and not self.unresolved(owner, repo):
+                branch = resolve_default_branch(owner, repo)
+                if branch:
+                    self.store(owner, repo, branch)
+                else:
+                    self._memory.set(key, UNRESOLVED, ttl=self.unresolved_ttl)
+        with self._guard:
+            self._locks.pop(key, None)
+        return branch
+
+    def forget(self, owner: str, repo: str) -> None:
+        """Drop a repo's branch so the next lookup resolves it again"""
+        key = (owner.lower(), repo.lower())
+        self._memory.pop(key)
+        if self._db is not None:
+            with self._guard:
+                self._db.execute("DELETE FROM default_branches WHERE owner = ? AND repo = ?", key)
+                self._db.commit()
+
+    def stats(self) -> dict:
+        return self._memory.stats()
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._guard:
+                self._db.close()
+            self._db = None
+
+
+_active = BranchCache()
+
+
+def enable(path: str = DEFAULT_DB, ttl: float = DEFAULT_TTL, max_memory: int = None) -> BranchCache:
+    """Persist resolved branches to path (otherwise they only live for this run)"""
+    global _active
+    _active.close()
+    _active = BranchCache(path, ttl=ttl, max_memory=max_memory)
+    return _active
+
+
+def active() -> BranchCache:
+    """The cache default_branch() currently uses"""
+    return _active
+
+
+def disable() -> None:
+    """Close the persisted cache and fall back to an in-memory one"""
+    global _active
+    _active.close()
+    _active = BranchCache()
+
+
+def default_branch(owner: str, repo: str, fetch: bool = True) -> Optional[str]:
+    """Default branch for owner/repo; with fetch=False only already-known branches are returned"""
+    if not fetch:
+        return _active.cached(owner, repo)
+    return _active.get(owner, repo)
+
+
+def candidate_branches(owner: str, repo: str, fetch: bool = True) -> list[str]:
+    """Branches to build raw URLs for: the known default, or main then master if unknown"""
+    branch = default_branch(owner, repo, fetch=fetch)
+    return [branch] if branch else list(FALLBACK_BRANCHES)
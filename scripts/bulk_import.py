@@ -1,8 +1,9 @@
 import json
-import requests
 import os
 import time
 
+import http_client
+
 def import_chunk(file_path, api_url, token):
     print(f"Importing {file_path}...")
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -23,7 +24,7 @@ def import_chunk(file_path, api_url, token):
     }
     
     try:
-        response = requests.post(f"{api_url}/api/admin/import", json=payload, headers=headers, timeout=60)
+        response = http_client.post(f"{api_url}/api/admin/import", json=payload, headers=headers, timeout=60)
         if response.status_code == 200:
             result = response.json()
             print(f"  Success: Imported {result.get('imported', 0)} skills, {result.get('errors', 0)} errors.")
@@ -62,9 +63,6 @@ def main():
             total_imported += c
         else:
             total_errors += c
-        
-        # Short sleep to prevent overwhelming the local worker
-        time.sleep(1)
 
     duration = time.time() - start_time
     print("\n" + "="*30)
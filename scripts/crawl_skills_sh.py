@@ -11,22 +11,40 @@ URL Structure:
 - Example: https://skills.sh/expo/skills/upgrading-expo
 
 Usage:
-    python crawl_skills_sh.py [--output skills_data.json] [--max-skills N]
+    python crawl_skills_sh.py [--output skills_data.json] [--max-skills N] [--concurrency N]
+    python crawl_skills_sh.py --output skills_data.json --resume   # continue a crashed crawl
+    python crawl_skills_sh.py --incremental --previous old.json   # only refetch what changed
+    python crawl_skills_sh.py --blob-store skill_md_blobs      # SKILL.md bodies by reference
 """
 
 import re
 import json
-import time
+import os
 import argparse
+import asyncio
+import hashlib
+import threading
 import uuid
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, fields
 from typing import Optional
 from pathlib import Path
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
-import yaml
+
+import blob_store
+import branch_cache
+import http_cache
+import http_client
+import identity
+import repo_archive
+import html_extract
+from jsonl_io import is_jsonl, read_records, write_records
+from metrics import METRICS, add_metrics_arguments, write_reports
+from repo_tree import RepoTreeIndex
+from skill_md import SkillMd, parse_skill_md, skill_fields
 
 
 # Constants
@@ -34,10 +52,40 @@ SKILLS_SH_URL = "https://skills.sh"
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
 GITHUB_API_BASE = "https://api.github.com"
 USER_AGENT = "RalphySkillsCrawler/2.0"
-REQUEST_DELAY = 0.3  # Delay between requests
+DEFAULT_CACHE_DB = "crawl_cache.sqlite"  # Persistent ETag/Last-Modified cache
+
+# Repos with at least this many skills in a crawl get one tarball download
+# instead of one raw request per SKILL.md (0 disables archive mode)
+ARCHIVE_THRESHOLD = 10
+
+# First path segments on skills.sh that are site pages, not skill owners
+SKIP_OWNERS = {"docs", "about", "login", "register", "privacy", "terms", "api"}
+
+# Max in-flight requests per host when crawling with --concurrency
+HOST_CONCURRENCY = {
+    "skills.sh": 4,
+    "raw.githubusercontent.com": 16,
+    "api.github.com": 4,
+}
+
+# Cache for repo structure to avoid repeat API calls: (owner, repo) -> {path: listing}
+# Keyed per repo so release_repo frees one with a single pop while other repos' workers add entries
+REPO_STRUCTURE_CACHE: dict[tuple[str, str], dict[str, Optional[list]]] = {}
+
+# Recursive git trees, fetched once per repo, used to locate SKILL.md files
+TREE_INDEX = RepoTreeIndex()
 
-# Cache for repo structure to avoid repeat API calls
-REPO_STRUCTURE_CACHE = {}
+# SKILL.md bodies pulled from repo archives: (owner, repo) -> {raw URL: body}
+PREFETCHED_SKILL_MD: dict[tuple[str, str], dict[str, str]] = {}
+
+# Where SKILL.md bodies go when the journal and output carry references (--blob-store)
+BLOB_STORE: Optional[blob_store.BlobStore] = None
+
+# Alias -> canonical id map, so a skill keeps its id across crawls and sources (--identity)
+IDENTITY: Optional[identity.IdentityIndex] = None
+
+# Per-host request slots, only populated while a concurrent crawl is running
+HOST_SLOTS: dict[str, threading.BoundedSemaphore] = {}
 
 
 @dataclass
@@ -63,15 +111,128 @@ class Skill:
     status: str = "published"
 
 
-def fetch_page(url: str, delay: float = REQUEST_DELAY) -> Optional[str]:
-    """Fetch a page with proper headers and rate limiting"""
+def skill_key(owner: str, repo: str, skill_slug: str) -> str:
+    """Stable key of a skill link, used by the journal"""
+    return f"{owner}/{repo}/{skill_slug}"
+
+
+def skill_to_record(skill: Skill) -> dict:
+    """Skill as an output record, with its SKILL.md body moved to the blob store if one is set"""
+    record = asdict(skill)
+    return blob_store.externalize(record, BLOB_STORE) if BLOB_STORE else record
+
+
+def skill_from_record(record: dict) -> Skill:
+    """
+    Skill from an output record, loading a referenced SKILL.md body back from the blob store.
+    
+    Raises ValueError if the body is referenced but can't be loaded, rather
+    than returning the skill as if it had no SKILL.md.
+    """
+    record = blob_store.inline(record, BLOB_STORE)
+    if record.get(blob_store.REF_FIELD):
+        where = f"in {BLOB_STORE.root}" if BLOB_STORE else "(no --blob-store given)"
+        raise ValueError(f"SKILL.md blob {record[blob_store.REF_FIELD]} of "
+                         f"{record.get('owner')}/{record.get('repo')}/{record.get('skill_slug')} not found {where}")
+    return Skill(**{f.name: record[f.name] for f in fields(Skill) if f.name in record})
+
+
+class CrawlJournal:
+    """Append-only JSONL log of completed skills, so a crashed crawl can --resume"""
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def load(self) -> dict[str, Skill]:
+        """Read completed skills keyed by skill_key (a torn last line is ignored)"""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    skill = skill_from_record(json.loads(line))
+                except (json.JSONDecodeError, TypeError, AttributeError):
+                    continue
+                done[skill_key(skill.owner, skill.repo, skill.skill_slug)] = skill
+        return done
+    
+    def has_references(self) -> bool:
+        """Whether any entry carries a skill_md_sha256 reference (written with --blob-store)"""
+        if not self.path.exists():
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            return any(f'"{blob_store.REF_FIELD}"' in line for line in f)
+    
+    def open(self, resume: bool = False) -> None:
+        """Start writing; a fresh crawl truncates the old journal"""
+        if resume:
+            self._drop_torn_line()
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+    
+    def _drop_torn_line(self) -> None:
+        """Cut a half-written last line from a crash, so new entries start on a line of their own"""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b"\n")
+                if newline >= 0:
+                    pos = start + newline + 1
+                    break
+                pos = start
+            if pos < end:
+                f.truncate(pos)
+    
+    def append(self, skill: Skill) -> None:
+        """Record a finished skill and flush it to disk right away"""
+        with self._lock:
+            self._file.write(json.dumps(skill_to_record(skill), ensure_ascii=False) + "\n")
+            self._file.flush()
+    
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def configure_host_limits(concurrency: int) -> None:
+    """Set up per-host request slots for a concurrent crawl (0 disables them)"""
+    HOST_SLOTS.clear()
+    if concurrency <= 1:
+        return
+    for host, limit in HOST_CONCURRENCY.items():
+        HOST_SLOTS[host] = threading.BoundedSemaphore(min(concurrency, limit))
+    # Hosts without a cap (github.com) can see one request per worker at once
+    http_client.configure(pool_maxsize=max(http_client.POOL_MAXSIZE, concurrency))
+
+
+@contextmanager
+def host_slot(url: str):
+    """Hold one of the host's request slots for the duration of a request"""
+    slot = HOST_SLOTS.get(urlparse(url).hostname or "")
+    if slot is None:
+        yield
+        return
+    with slot:
+        yield
+
+
+def fetch_page(url: str) -> Optional[str]:
+    """Fetch a page with proper headers (rate limited per host by http_client)"""
     try:
-        time.sleep(delay)
         headers = {
             "User-Agent": USER_AGENT,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
         }
-        response = requests.get(url, headers=headers, timeout=30)
+        with host_slot(url):
+            response = http_client.get(url, headers=headers)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -79,15 +240,15 @@ def fetch_page(url: str, delay: float = REQUEST_DELAY) -> Optional[str]:
         return None
 
 
-def fetch_json(url: str, delay: float = REQUEST_DELAY) -> Optional[dict]:
+def fetch_json(url: str) -> Optional[dict]:
     """Fetch JSON data from an API endpoint"""
     try:
-        time.sleep(delay)
         headers = {
             "User-Agent": USER_AGENT,
             "Accept": "application/json"
         }
-        response = requests.get(url, headers=headers, timeout=30)
+        with host_slot(url):
+            response = http_cache.get(url, headers=headers)
         if response.status_code == 404:
             return None
         response.raise_for_status()
@@ -99,8 +260,8 @@ def fetch_json(url: str, delay: float = REQUEST_DELAY) -> Optional[dict]:
 def fetch_raw_url(url: str) -> Optional[str]:
     """Fetch content from a raw URL"""
     try:
-        time.sleep(REQUEST_DELAY / 2)
-        response = requests.get(url, timeout=20)
+        with host_slot(url):
+            response = http_cache.get(url)
         if response.status_code == 200:
             return response.text
         return None
@@ -128,59 +289,45 @@ def fetch_skill_page_details(skill_url: str) -> dict:
     html = fetch_page(skill_url)
     if not html:
         return {}
-    
-    soup = BeautifulSoup(html, "html.parser")
+    return parse_skill_page(html)
+
+
+def parse_skill_page(html: str) -> dict:
+    """Extract description and install count from a skills.sh skill page"""
+    fields = html_extract.get_backend().skill_page(
+        html, ignore_descriptions={"Discover and install skills for AI agents."}
+    )
     
     result = {
-        "description": "",
+        "description": fields.meta_description,
         "installs": 0
     }
     
-    # Get description from meta tags
-    for selector in ["meta[property='og:description']", "meta[name='description']"]:
-        meta = soup.select_one(selector)
-        if meta and meta.get("content"):
-            desc = meta.get("content", "")
-            if desc and desc != "Discover and install skills for AI agents.":
-                result["description"] = desc
-                break
-    
-    # Try to find description in page content - look for h1 then next text
-    h1 = soup.find("h1")
-    if h1 and not result["description"]:
-        # Look for text content after h1
-        for sibling in h1.find_next_siblings():
-            text = sibling.get_text(strip=True)
+    # Fall back to the text following the h1
+    if not result["description"]:
+        for text in fields.h1_sibling_texts:
             if text and len(text) > 20 and len(text) < 500:
                 # Check if it's not just a list of links
                 if not text.startswith("http") and not "skills" in text.lower():
                     result["description"] = text
                     break
     
-    # Look for install count - typically shown as a number with K suffix
-    page_text = soup.get_text()
-    install_match = re.search(r'(\d+(?:\.\d+)?[KkMm]?)\s*(?:install|download|use)', page_text)
-    if install_match:
-        result["installs"] = parse_install_count(install_match.group(1))
+    # Install count - typically shown as a number with K suffix
+    if fields.install_text:
+        result["installs"] = parse_install_count(fields.install_text)
     
     return result
 
 
 def extract_skills_from_homepage(html: str) -> list[dict]:
     """Extract skill links and metadata from skills.sh homepage"""
-    soup = BeautifulSoup(html, "html.parser")
     skills = []
     seen = set()  # Track seen skill urls to avoid duplicates
     
     # Pattern: /owner/repo/skill (but not /owner/repo which is just repo listing)
     skill_pattern = re.compile(r'^/([^/]+)/([^/]+)/([^/]+)$')
     
-    # Skip patterns
-    skip_owners = {"docs", "about", "login", "register", "privacy", "terms", "api"}
-    
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
-        
+    for href, parent_text in html_extract.get_backend().links(html):
         # Handle both relative and absolute URLs
         if href.startswith("https://skills.sh/"):
             href = "/" + "/".join(href.split("/")[3:])
@@ -192,7 +339,7 @@ def extract_skills_from_homepage(html: str) -> list[dict]:
         owner, repo, skill_slug = match.groups()
         
         # Skip non-skill pages
-        if owner.lower() in skip_owners:
+        if owner.lower() in SKIP_OWNERS:
             continue
         if skill_slug.lower() in ["skills", "plugins"]:
             continue
@@ -204,9 +351,7 @@ def extract_skills_from_homepage(html: str) -> list[dict]:
         
         # Try to find install count from sibling text
         installs = 0
-        parent = link.parent
-        if parent:
-            parent_text = parent.get_text(separator=" ", strip=True)
+        if parent_text:
             # Look for numbers with K suffix
             numbers = re.findall(r'(\d+(?:\.\d+)?K?)\s*$', parent_text)
             if numbers:
@@ -223,29 +368,122 @@ def extract_skills_from_homepage(html: str) -> list[dict]:
     return skills
 
 
+def apply_embedded_metadata(skill_links: list[dict], html: str) -> list[dict]:
+    """
+    Fill description/installs/rank of skill links from data embedded in the page.
+    
+    Skills that only appear in the embedded data are appended. If every link
+    ends up with an embedded rank, the list is returned in rank order.
+    """
+    embedded = html_extract.extract_embedded_skills(html)
+    if not embedded:
+        return skill_links
+    
+    by_key = {skill_key(s["owner"], s["repo"], s["skill_slug"]): s for s in skill_links}
+    for key, data in embedded.items():
+        info = by_key.get(key)
+        if info is None:
+            parts = key.split("/")
+            if len(parts) != 3 or not all(parts):
+                METRICS.inc("embedded_keys_malformed")
+                continue
+            owner, repo, skill_slug = parts
+            if owner.lower() in SKIP_OWNERS or skill_slug.lower() in ["skills", "plugins"]:
+                continue
+            info = {"owner": owner, "repo": repo, "skill_slug": skill_slug,
+                    "url": f"{SKILLS_SH_URL}/{key}", "installs": 0}
+            skill_links.append(info)
+        info["description"] = info.get("description") or data["description"]
+        info["installs"] = data["installs"] or info["installs"]
+        if data["rank"]:
+            info["rank"] = data["rank"]
+    
+    if all(s.get("rank") for s in skill_links):
+        skill_links.sort(key=lambda s: s["rank"])
+    return skill_links
+
+
 def get_repo_contents(owner: str, repo: str, path: str = "") -> Optional[list]:
     """Get contents of a repo path, with caching"""
-    cache_key = f"{owner}/{repo}/{path}"
-    if cache_key in REPO_STRUCTURE_CACHE:
-        return REPO_STRUCTURE_CACHE[cache_key]
+    listings = REPO_STRUCTURE_CACHE.setdefault((owner, repo), {})
+    if path in listings:
+        return listings[path]
     
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}".rstrip("/")
     result = fetch_json(url)
-    REPO_STRUCTURE_CACHE[cache_key] = result
+    listings[path] = result
     return result
 
 
 def check_raw_url_exists(url: str) -> bool:
     """Quick check if raw URL exists"""
     try:
-        response = requests.head(url, timeout=5)
+        with host_slot(url):
+            response = http_client.head(url)
         return response.status_code == 200
     except:
         return False
 
 
+def group_by_repo(pending: list[tuple[int, dict]]) -> list[tuple[tuple[str, str], list[tuple[int, dict]]]]:
+    """Group (rank, skill_info) pairs by owner/repo, repos in order of first appearance"""
+    groups: dict[tuple[str, str], list[tuple[int, dict]]] = {}
+    for rank, info in pending:
+        groups.setdefault((info["owner"], info["repo"]), []).append((rank, info))
+    return list(groups.items())
+
+
+def release_repo(owner: str, repo: str) -> None:
+    """Drop cached tree, contents listings and prefetched SKILL.md files of a finished repo"""
+    TREE_INDEX.forget(owner, repo)
+    REPO_STRUCTURE_CACHE.pop((owner, repo), None)
+    PREFETCHED_SKILL_MD.pop((owner, repo), None)
+
+
+def prefetch_repo_archive(owner: str, repo: str) -> int:
+    """Pull every SKILL.md of a repo from its tarball. Returns how many were found."""
+    tree = TREE_INDEX.get(owner, repo)
+    if not tree:
+        return 0
+    contents = repo_archive.fetch_skill_mds(owner, repo, tree.branch)
+    if not contents:
+        return 0
+    PREFETCHED_SKILL_MD[(owner, repo)] = {tree.raw_url(path): content for path, content in contents.items()}
+    return len(contents)
+
+
+def raw_url_repo(url: str) -> Optional[tuple[str, str]]:
+    """(owner, repo) of a raw.githubusercontent.com URL"""
+    if not url.startswith(GITHUB_RAW_BASE + "/"):
+        return None
+    parts = url[len(GITHUB_RAW_BASE) + 1:].split("/")
+    return (parts[0], parts[1]) if len(parts) > 2 else None
+
+
+def get_skill_md_content(url: str) -> Optional[str]:
+    """SKILL.md body from a prefetched archive, or fetched from its raw URL"""
+    prefetched = PREFETCHED_SKILL_MD.get(raw_url_repo(url), {})
+    return prefetched.get(url) or fetch_raw_url(url)
+
+
 def search_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[str]:
+    """
+    Find the SKILL.md URL for a skill.
+    
+    Uses the repo's recursive tree when it can be listed in full; otherwise
+    falls back to probing the usual locations.
+    """
+    tree = TREE_INDEX.get(owner, repo)
+    if tree:
+        url = TREE_INDEX.find_skill_md_url(owner, repo, skill_slug)
+        if url or not tree.truncated:
+            return url
+    return probe_skill_md_in_repo(owner, repo, skill_slug)
+
+
+def probe_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[str]:
     """Search for SKILL.md in various possible locations within a repo"""
+    branches = branch_cache.candidate_branches(owner, repo)
     
     # Try common patterns first (quick checks)
     quick_patterns = [
@@ -254,7 +492,7 @@ def search_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[
     ]
     
     for pattern in quick_patterns:
-        for branch in ["main", "master"]:
+        for branch in branches:
             url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/{pattern}"
             if check_raw_url_exists(url):
                 return url
@@ -279,7 +517,7 @@ def search_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[
         if skill_contents:
             for item in skill_contents:
                 if item.get("type") == "dir" and item.get("name") == skill_slug:
-                    for branch in ["main", "master"]:
+                    for branch in branches:
                         url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/skills/{skill_slug}/SKILL.md"
                         if check_raw_url_exists(url):
                             return url
@@ -298,14 +536,14 @@ def search_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[
                 if plugin_skills_contents:
                     for skill_item in plugin_skills_contents:
                         if skill_item.get("type") == "dir" and skill_item.get("name") == skill_slug:
-                            for branch in ["main", "master"]:
+                            for branch in branches:
                                 url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/plugins/{plugin_name}/skills/{skill_slug}/SKILL.md"
                                 if check_raw_url_exists(url):
                                     return url
     
     # Check if skill_slug matches a root directory
     if skill_slug in skill_dirs:
-        for branch in ["main", "master"]:
+        for branch in branches:
             url = f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/{skill_slug}/SKILL.md"
             if check_raw_url_exists(url):
                 return url
@@ -313,73 +551,221 @@ def search_skill_md_in_repo(owner: str, repo: str, skill_slug: str) -> Optional[
     return None
 
 
-def parse_skill_md(content: str) -> dict:
-    """Parse SKILL.md YAML frontmatter and content"""
-    result = {
-        "name": "",
-        "description": "",
-        "version": "1.0.0",
-        "license": "",
-        "keywords": [],
-        "author": "",
-        "content": content
+def build_skill(skill_info: dict, rank: int) -> Skill:
+    """Fetch page details and SKILL.md for one skill link and build its record"""
+    owner = skill_info["owner"]
+    repo = skill_info["repo"]
+    skill_slug = skill_info["skill_slug"]
+    
+    # Fetch the skill page on skills.sh only for what the listing did not provide
+    page_details = {}
+    if not (skill_info.get("description") and skill_info["installs"]):
+        page_details = fetch_skill_page_details(skill_info["url"])
+    description = skill_info.get("description") or page_details.get("description", "")
+    installs = skill_info["installs"] or page_details.get("installs", 0)
+    
+    # Search for SKILL.md
+    skill_md_url = search_skill_md_in_repo(owner, repo, skill_slug)
+    skill_md_content = ""
+    parsed_md = SkillMd()
+    
+    if skill_md_url:
+        skill_md_content = get_skill_md_content(skill_md_url) or ""
+        if skill_md_content:
+            parsed_md = parse_skill_md(skill_md_content)
+    
+    # Use parsed description if not found on page
+    if not description and parsed_md.description:
+        description = parsed_md.description
+    if not description:
+        description = f"Agent skill from {owner}/{repo}"
+    
+    return Skill(
+        id=str(uuid.uuid4()),
+        name=parsed_md.name or skill_slug.replace("-", " ").title(),
+        description=description[:500],  # Limit description length
+        owner=owner,
+        repo=repo,
+        skill_slug=skill_slug,
+        version=parsed_md.version,
+        license=parsed_md.license,
+        github_url=f"https://github.com/{owner}/{repo}",
+        skill_md_url=skill_md_url or "",
+        skill_md_content=skill_md_content,
+        skillssh_rank=rank,
+        skillssh_installs=installs,
+        author=parsed_md.author or owner,
+        tags=json.dumps(list(parsed_md.keywords))
+    )
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a SKILL.md body"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def load_previous_crawl(path: str) -> dict[str, dict]:
+    """Load an earlier crawl output (JSON or JSONL) keyed by skill_key, for --incremental"""
+    return {
+        skill_key(s.get("owner", ""), s.get("repo", ""), s.get("skill_slug", "")): s
+        for s in read_records(path)
     }
+
+
+def is_unchanged(skill_info: dict, rank: int, previous: dict) -> bool:
+    """
+    Whether a skill link matches its previous record.
     
-    if not content.startswith("---"):
-        return result
+    An install count of 0 means the homepage did not show one, so only the
+    rank can be compared. A record whose SKILL.md was never located is
+    always crawled again, since there is nothing to refresh.
+    """
+    if not previous.get("skill_md_url"):
+        return False
+    if previous.get("skillssh_rank") != rank:
+        return False
+    return not skill_info["installs"] or skill_info["installs"] == previous.get("skillssh_installs")
+
+
+def refresh_skill_md(skill: Skill) -> bool:
+    """
+    Re-fetch a carried-over skill's SKILL.md and apply it if the body changed.
     
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return result
+    Goes through the HTTP cache, so an unchanged file usually costs one 304.
+    Returns True when the record was updated.
+    """
+    if not skill.skill_md_url:
+        return False
+    content = get_skill_md_content(skill.skill_md_url)
+    if not content or content_hash(content) == content_hash(skill.skill_md_content):
+        return False
     
-    try:
-        frontmatter = yaml.safe_load(parts[1])
-        if isinstance(frontmatter, dict):
-            result["name"] = frontmatter.get("name", "")
-            result["description"] = frontmatter.get("description", "")
-            result["version"] = frontmatter.get("version", "1.0.0")
-            result["license"] = frontmatter.get("license", "")
-            result["keywords"] = frontmatter.get("keywords", [])
-            
-            # Handle author in different formats
-            author = frontmatter.get("author")
-            if isinstance(author, dict):
-                result["author"] = author.get("name", "")
-            elif author:
-                result["author"] = str(author)
-            
-            # Check metadata for additional fields
-            metadata = frontmatter.get("metadata", {})
-            if isinstance(metadata, dict):
-                if not result["author"] and metadata.get("author"):
-                    result["author"] = metadata.get("author")
-                if not result["version"] and metadata.get("version"):
-                    result["version"] = metadata.get("version")
-        
-        result["content"] = parts[2].strip()
-    except yaml.YAMLError:
-        pass
+    skill.skill_md_content = content
+    for name, value in skill_fields(parse_skill_md(content), asdict(skill)).items():
+        setattr(skill, name, value)
+    return True
+
+
+def crawl_skill(skill_info: dict, rank: int, previous: dict[str, dict] = None) -> Skill:
+    """
+    Build one skill, reusing its previous record when running incrementally.
+    
+    Unchanged links keep their old record and id and only get a SKILL.md
+    refresh; new or changed links are fetched in full but keep their old id.
+    """
+    record = None
+    if previous:
+        record = previous.get(skill_key(skill_info["owner"], skill_info["repo"], skill_info["skill_slug"]))
+    if record and is_unchanged(skill_info, rank, record):
+        skill = skill_from_record(record)
+        refresh_skill_md(skill)
+        return skill
+    
+    skill = build_skill(skill_info, rank)
+    if record and record.get("id"):
+        skill.id = record["id"]
+    if IDENTITY:
+        # Lookup only: a fresh uuid4 is kept for an unknown skill but never registered as canonical
+        skill.id = IDENTITY.resolve(asdict(skill), assign=False, register=False)
+    return skill
+
+
+def print_skill_status(skill: Skill, verbose: bool = True) -> None:
+    """Print whether a crawled skill's SKILL.md was located and fetched"""
+    if not verbose:
+        return
+    if skill.skill_md_content:
+        print(f"    ✓ Found SKILL.md")
+    elif skill.skill_md_url:
+        print(f"    ✗ Failed to fetch SKILL.md content")
+    else:
+        print(f"    ✗ Could not locate SKILL.md")
+
+
+async def crawl_skills_async(pending: list[tuple[int, dict]], concurrency: int, verbose: bool = True,
+                             journal: CrawlJournal = None, previous: dict[str, dict] = None,
+                             archive_threshold: int = ARCHIVE_THRESHOLD) -> list[Skill]:
+    """
+    Build skills concurrently, capping in-flight requests per host.
+    
+    pending holds (rank, skill_info) pairs. Work is scheduled per owner/repo:
+    at most concurrency repos are in flight, each repo's skills share one tree
+    lookup (or one archive download at archive_threshold skills or more), and
+    the repo's cached state is released when its skills finish.
+    Each skill runs in a worker thread; requests inside it wait on the
+    per-host slots from configure_host_limits. Results are grouped by repo,
+    not in rank order.
+    """
+    configure_host_limits(concurrency)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    gate = asyncio.Semaphore(concurrency)
+    repo_gate = asyncio.Semaphore(concurrency)
+    total = len(pending)
+    done = 0
+    
+    async def run(rank: int, skill_info: dict) -> Skill:
+        nonlocal done
+        async with gate:
+            skill = await asyncio.to_thread(crawl_skill, skill_info, rank, previous)
+        if journal:
+            journal.append(skill)
+        done += 1
+        print(f"  [{done}/{total}] {skill.owner}/{skill.repo}/{skill.skill_slug} (rank {rank})")
+        print_skill_status(skill, verbose)
+        return skill
+    
+    async def run_repo(owner: str, repo: str, items: list[tuple[int, dict]]) -> list[Skill]:
+        async with repo_gate:
+            try:
+                if archive_threshold and len(items) >= archive_threshold:
+                    await asyncio.to_thread(prefetch_repo_archive, owner, repo)
+                return await asyncio.gather(*(run(rank, info) for rank, info in items))
+            finally:
+                release_repo(owner, repo)
     
-    return result
-
-
-def crawl_all_skills(max_skills: int = None, verbose: bool = True) -> list[Skill]:
-    """Main crawling function - fetches all skills from skills.sh"""
+    try:
+        results = await asyncio.gather(*(run_repo(owner, repo, items) for (owner, repo), items in group_by_repo(pending)))
+        return [skill for repo_skills in results for skill in repo_skills]
+    finally:
+        configure_host_limits(0)
+
+
+def crawl_all_skills(max_skills: int = None, verbose: bool = True, concurrency: int = 1,
+                     journal: CrawlJournal = None, resume: bool = False,
+                     previous: dict[str, dict] = None,
+                     archive_threshold: int = ARCHIVE_THRESHOLD) -> list[Skill]:
+    """
+    Main crawling function - fetches all skills from skills.sh
+    
+    With a journal, every finished skill is appended to it as it completes;
+    with resume, skills already in the journal are reused instead of refetched.
+    With previous (an earlier crawl keyed by skill_key), unchanged skills are
+    carried over and only new or changed ones are fetched in full.
+    Repos with archive_threshold or more skills get their SKILL.md files from
+    one tarball download.
+    """
     print("=" * 60)
     print("Skills.sh Crawler v2")
     print("=" * 60)
     
     # Step 1: Fetch homepage
     print("\n[1/4] Fetching skills.sh homepage...")
-    homepage_html = fetch_page(SKILLS_SH_URL)
+    with METRICS.phase("homepage"):
+        homepage_html = fetch_page(SKILLS_SH_URL)
     if not homepage_html:
         print("  [ERROR] Failed to fetch homepage")
         return []
     
     # Step 2: Extract skill links
     print("\n[2/4] Extracting skill links...")
-    skill_links = extract_skills_from_homepage(homepage_html)
-    print(f"  Found {len(skill_links)} unique skill links")
+    with METRICS.phase("extract"):
+        skill_links = extract_skills_from_homepage(homepage_html)
+        print(f"  Found {len(skill_links)} unique skill links")
+        skill_links = apply_embedded_metadata(skill_links, homepage_html)
+    print(f"  {len(skill_links)} skill links after reading embedded page data")
+    with_metadata = sum(1 for s in skill_links if s.get("description") and s["installs"])
+    print(f"  {with_metadata} skills fully described by embedded page data (no page fetch needed)")
     
     if max_skills:
         skill_links = skill_links[:max_skills]
@@ -387,66 +773,61 @@ def crawl_all_skills(max_skills: int = None, verbose: bool = True) -> list[Skill
     
     # Step 3: Fetch each skill's details
     print("\n[3/4] Fetching skill details...")
-    skills = []
-    skills_with_md = 0
-    
+    completed = journal.load() if journal and resume else {}
+    skills_by_rank = {}
+    pending = []
     for i, skill_info in enumerate(skill_links, 1):
-        owner = skill_info["owner"]
-        repo = skill_info["repo"]
-        skill_slug = skill_info["skill_slug"]
-        
-        print(f"  [{i}/{len(skill_links)}] {owner}/{repo}/{skill_slug}")
-        
-        # Fetch description from skill page on skills.sh
-        page_details = fetch_skill_page_details(skill_info["url"])
-        description = page_details.get("description", "")
-        installs = skill_info["installs"] or page_details.get("installs", 0)
-        
-        # Search for SKILL.md
-        skill_md_url = search_skill_md_in_repo(owner, repo, skill_slug)
-        skill_md_content = ""
-        parsed_md = {}
-        
-        if skill_md_url:
-            skill_md_content = fetch_raw_url(skill_md_url) or ""
-            if skill_md_content:
-                parsed_md = parse_skill_md(skill_md_content)
-                skills_with_md += 1
-                if verbose:
-                    print(f"    ✓ Found SKILL.md")
-            else:
-                if verbose:
-                    print(f"    ✗ Failed to fetch SKILL.md content")
+        skill = completed.get(skill_key(skill_info["owner"], skill_info["repo"], skill_info["skill_slug"]))
+        if skill:
+            skill.skillssh_rank = i
+            skills_by_rank[i] = skill
         else:
-            if verbose:
-                print(f"    ✗ Could not locate SKILL.md")
-        
-        # Use parsed description if not found on page
-        if not description and parsed_md.get("description"):
-            description = parsed_md["description"]
-        if not description:
-            description = f"Agent skill from {owner}/{repo}"
-        
-        # Create skill object
-        skill = Skill(
-            id=str(uuid.uuid4()),
-            name=parsed_md.get("name") or skill_slug.replace("-", " ").title(),
-            description=description[:500],  # Limit description length
-            owner=owner,
-            repo=repo,
-            skill_slug=skill_slug,
-            version=parsed_md.get("version", "1.0.0"),
-            license=parsed_md.get("license", ""),
-            github_url=f"https://github.com/{owner}/{repo}",
-            skill_md_url=skill_md_url or "",
-            skill_md_content=skill_md_content,
-            skillssh_rank=i,
-            skillssh_installs=installs,
-            author=parsed_md.get("author") or owner,
-            tags=json.dumps(parsed_md.get("keywords", []))
+            pending.append((i, skill_info))
+    if completed:
+        print(f"  Resuming: {len(skills_by_rank)} skills from journal, {len(pending)} left to crawl")
+    if previous:
+        unchanged = sum(
+            1 for i, info in pending
+            if is_unchanged(info, i, previous.get(skill_key(info["owner"], info["repo"], info["skill_slug"]), {}))
         )
-        
-        skills.append(skill)
+        print(f"  Incremental: {unchanged} unchanged skills carried over, {len(pending) - unchanged} new or changed")
+    
+    with METRICS.phase("details"):
+        if journal:
+            journal.open(resume=resume)
+        try:
+            if concurrency > 1:
+                print(f"  Running with concurrency {concurrency}")
+                crawled = asyncio.run(crawl_skills_async(pending, concurrency, verbose, journal, previous,
+                                                            archive_threshold))
+            else:
+                crawled = []
+                # One repo at a time, so its tree is fetched once and freed after
+                for (owner, repo), items in group_by_repo(pending):
+                    try:
+                        if archive_threshold and len(items) >= archive_threshold:
+                            found = prefetch_repo_archive(owner, repo)
+                            print(f"  {owner}/{repo}: {found} SKILL.md files from repo archive")
+                        for i, skill_info in items:
+                            print(f"  [{i}/{len(skill_links)}] {owner}/{repo}/{skill_info['skill_slug']}")
+                            skill = crawl_skill(skill_info, i, previous)
+                            if journal:
+                                journal.append(skill)
+                            print_skill_status(skill, verbose)
+                            crawled.append(skill)
+                    finally:
+                        release_repo(owner, repo)
+        finally:
+            if journal:
+                journal.close()
+    
+    for skill in crawled:
+        skills_by_rank[skill.skillssh_rank] = skill
+    skills = [skills_by_rank[i] for i in sorted(skills_by_rank)]
+    
+    skills_with_md = sum(1 for s in skills if s.skill_md_content)
+    METRICS.inc("skills_crawled", len(skills))
+    METRICS.inc("skills_with_md", skills_with_md)
     
     print(f"\n[4/4] Processing complete!")
     print(f"  Total skills crawled: {len(skills)}")
@@ -457,10 +838,13 @@ def crawl_all_skills(max_skills: int = None, verbose: bool = True) -> list[Skill
 
 
 def save_to_json(skills: list[Skill], output_path: str) -> None:
-    """Save skills to a JSON file"""
-    data = [asdict(s) for s in skills]
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save skills to a JSON file, or stream them out if the path is .jsonl / .jsonl.gz"""
+    if is_jsonl(output_path):
+        write_records(output_path, (skill_to_record(s) for s in skills))
+    else:
+        data = [skill_to_record(s) for s in skills]
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"\nSaved {len(skills)} skills to {output_path}")
 
 
@@ -478,26 +862,94 @@ def print_summary(skills: list[Skill]) -> None:
 def main():
     parser = argparse.ArgumentParser(description="Crawl skills.sh and store skills")
     parser.add_argument("--output", "-o", default="skills_sh_data.json",
-                       help="Output JSON file path")
+                       help="Output file path (.json, or .jsonl / .jsonl.gz to stream)")
     parser.add_argument("--max-skills", "-m", type=int, default=None,
                        help="Maximum number of skills to crawl")
     parser.add_argument("--quiet", "-q", action="store_true",
                        help="Reduce output verbosity")
+    parser.add_argument("--concurrency", "-c", type=int, default=1,
+                       help="Number of skills to crawl in parallel (per-host caps still apply)")
+    parser.add_argument("--html-parser", default="auto",
+                       choices=["auto"] + html_extract.PARSER_PREFERENCE,
+                       help="HTML parser backend (auto prefers lxml when installed)")
+    parser.add_argument("--archive-threshold", type=int, default=ARCHIVE_THRESHOLD,
+                       help="Download a repo tarball when it has at least this many skills (0 disables)")
+    parser.add_argument("--cache-db", default=DEFAULT_CACHE_DB,
+                       help="SQLite file for the persistent HTTP cache")
+    parser.add_argument("--branch-cache", default=branch_cache.DEFAULT_DB,
+                       help="SQLite file for resolved default branches")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Disable the persistent HTTP and branch caches")
+    parser.add_argument("--journal", default=None,
+                       help="Progress journal path (default: <output>.journal.jsonl)")
+    parser.add_argument("--resume", "-r", action="store_true",
+                       help="Skip skills already recorded in the journal")
+    parser.add_argument("--incremental", "-i", action="store_true",
+                       help="Only refetch skills that are new or changed since --previous")
+    parser.add_argument("--previous", default=None,
+                       help="Earlier crawl output to carry unchanged skills (and ids) over from")
+    parser.add_argument("--blob-store", default=None,
+                       help="Directory for SKILL.md bodies; journal and output then carry skill_md_sha256 references")
+    parser.add_argument("--identity", default=identity.DEFAULT_DB,
+                       help="SQLite file for the skill identity index (new skills reuse known ids)")
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
+    html_extract.select_parser(args.html_parser)
+    
+    global BLOB_STORE, IDENTITY
+    if args.blob_store:
+        BLOB_STORE = blob_store.BlobStore(args.blob_store)
+    IDENTITY = identity.IdentityIndex(args.identity)
+    
+    previous = None
+    if args.incremental:
+        if not args.previous or not Path(args.previous).exists():
+            parser.error("--incremental needs --previous pointing at an earlier crawl output")
+        previous = load_previous_crawl(args.previous)
+        if not BLOB_STORE and any(record.get(blob_store.REF_FIELD) for record in previous.values()):
+            parser.error(f"{args.previous} holds SKILL.md blob references; pass the --blob-store it was written with")
+        print(f"Loaded {len(previous)} skills from {args.previous}")
+    
+    if not args.no_cache:
+        http_cache.enable(args.cache_db)
+        branch_cache.enable(args.branch_cache)
+    
+    journal = CrawlJournal(args.journal or f"{args.output}.journal.jsonl")
+    if args.resume and not BLOB_STORE and journal.has_references():
+        parser.error(f"{journal.path} holds SKILL.md blob references; resume with the --blob-store it was written with")
+    
     # Crawl skills
-    skills = crawl_all_skills(max_skills=args.max_skills, verbose=not args.quiet)
+    try:
+        skills = crawl_all_skills(max_skills=args.max_skills, verbose=not args.quiet,
+                                  concurrency=args.concurrency, journal=journal, resume=args.resume,
+                                  previous=previous, archive_threshold=args.archive_threshold)
+    finally:
+        cache_stats = http_cache.stats()
+        if cache_stats:
+            print(f"\nHTTP cache: {cache_stats['hits']} hits (304), {cache_stats['misses']} misses, "
+                  f"{cache_stats['entries']} entries, {cache_stats['bytes'] / 1024 / 1024:.1f} MB")
+        http_cache.disable()
+        branch_cache.disable()
+        IDENTITY.close()
     
     if skills:
         # Save to JSON
-        save_to_json(skills, args.output)
+        with METRICS.phase("save"):
+            save_to_json(skills, args.output)
+        if BLOB_STORE:
+            blob_stats = BLOB_STORE.stats()
+            print(f"Blob store {args.blob_store}: {blob_stats['blobs']} SKILL.md bodies, "
+                  f"{blob_stats['bytes'] / 1024 / 1024:.1f} MB compressed")
         
         # Print summary
         if not args.quiet:
             print_summary(skills)
     else:
         print("\nNo skills were crawled. Please check the errors above.")
+    
+    write_reports(args, job="crawl_skills_sh")
 
 
 if __name__ == "__main__":
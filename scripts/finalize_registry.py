@@ -1,32 +1,26 @@
+import argparse
 import json
 import os
-import hashlib
 
-def get_skill_id(skill):
-    # Try to use existing ID
-    skill_id = skill.get('id')
-    if skill_id:
-        return skill_id
-    
-    # Generate from owner/repo/slug if missing
-    owner = skill.get('owner', '')
-    repo = skill.get('repo', '')
-    slug = skill.get('skill_slug', '')
-    if owner and repo and slug:
-        key = f"{owner}/{repo}/{slug}"
-        return hashlib.md5(key.encode()).hexdigest()[:12]
-    
-    # Fallback to source URL
-    source = skill.get('source') or skill.get('github_url') or skill.get('gitUrl', '')
-    if source:
-        return hashlib.md5(source.encode()).hexdigest()[:12]
-    
-    return None
+from blob_store import BlobStore, has_content, inline
+from jsonl_io import read_records
+from identity import DEFAULT_DB as IDENTITY_DB, IdentityIndex
+from merge_sources import KeyIndex, get_skill_id
 
 def main():
+    parser = argparse.ArgumentParser(description="Merge the skills.sh crawl into the registry and write its chunks")
+    parser.add_argument("--blob-store", default=None,
+                       help="Blob store directory the crawl wrote skill_md_sha256 references to; "
+                            "bodies are loaded back inline for the registry")
+    args = parser.parse_args()
+
     reg_path = 'data/skills_registry.json'
     crawled_path = 'skills_sh_crawled.json'
+    if not os.path.exists(crawled_path) and os.path.exists('skills_sh_crawled.jsonl'):
+        crawled_path = 'skills_sh_crawled.jsonl'
     output_dir = 'data/registry_chunks'
+    # The API import reads skill_md_content, so the registry always carries bodies inline
+    store = BlobStore(args.blob_store) if args.blob_store else None
     chunk_size = 2000
 
     print(f"Loading {reg_path}...")
@@ -36,50 +30,63 @@ def main():
     skills = registry.get('skills', [])
     print(f"Registry has {len(skills)} skills.")
 
-    print(f"Loading {crawled_path}...")
-    with open(crawled_path, 'r', encoding='utf-8') as f:
-        crawled_data = json.load(f)
-    
-    # Note: crawled_data might be a list or a dict with 'skills' key
-    if isinstance(crawled_data, dict):
-        crawled_skills = crawled_data.get('skills', [])
-    else:
-        crawled_skills = crawled_data
-
-    print(f"Crawled data has {len(crawled_skills)} skills.")
+    print(f"Streaming {crawled_path}...")
+    # read_records handles a JSON list, a dict with 'skills' key, or JSONL
+    crawled_skills = read_records(crawled_path)
 
-    # Deduplication map
-    # We'll use a set of (owner, repo, skill_slug) for tracking
-    seen_keys = set()
+    # Deduplication index (on disk), keyed by canonical skill id
+    # For more than two sources use merge_sources.py
+    identities = IdentityIndex(IDENTITY_DB)
+    index = KeyIndex()
+    registry_count = len(skills)
+    # The registry is seeded into the identity index first, so its ids are the
+    # canonical ones and crawl records for the same skill resolve to them
+    seeded = set()
+    registry_ids = []  # (record, id it had in the registry), checked before saving
+    kept = []
     for s in skills:
-        owner = s.get('owner', '').lower()
-        repo = s.get('repo', '').lower()
-        slug = s.get('skill_slug', '').lower()
-        if owner and repo and slug:
-            seen_keys.add((owner, repo, slug))
+        if s.get('id'):
+            if s['id'] in seeded or identities.matches(s) & seeded:
+                continue
+            seeded.add(identities.seed(s))
+            index.claim(s['id'])
+        elif (key := identities.key(s)) is not None and not index.claim(key)[0]:
+            continue
+        registry_ids.append((s, s.get('id')))
+        kept.append(inline(s, store))
+    skills = kept
+    if len(skills) < registry_count:
+        print(f"Dropped {registry_count - len(skills)} registry duplicates.")
 
     merged_count = 0
+    crawled_count = 0
     for s in crawled_skills:
-        owner = s.get('owner', '').lower()
-        repo = s.get('repo', '').lower()
-        slug = s.get('skill_slug', '').lower()
+        crawled_count += 1
         
         # Ensure ID exists
         if not s.get('id'):
             s['id'] = get_skill_id(s)
 
-        key = (owner, repo, slug)
-        if key == ('', '', ''):
-           # Use ID as fallback key
-           key = s.get('id')
-        
-        if key not in seen_keys:
-            skills.append(s)
-            seen_keys.add(key)
+        # Any alias bound to a registry id makes it a registry skill, even if its own id is known elsewhere
+        if identities.matches(s) & seeded:
+            continue
+        key = identities.key(s)
+        if key and index.claim(key)[0]:
+            skills.append(inline(s, store))
             merged_count += 1
+    index.close()
+    identities.close()
 
+    print(f"Crawled data has {crawled_count} skills.")
     print(f"Merged {merged_count} new skills from skills.sh.")
     print(f"Total skills now: {len(skills)}")
+    changed = [(before, s.get('id')) for s, before in registry_ids if before and s.get('id') != before]
+    if changed:
+        raise SystemExit(f"Refusing to save: {len(changed)} registry ids would change "
+                         f"(e.g. {changed[0][0]} -> {changed[0][1]}); the API import keys on them")
+    unresolved = sum(1 for s in skills if has_content(s) and not s.get('skill_md_content'))
+    if unresolved:
+        print(f"Warning: {unresolved} skills reference a SKILL.md body that was not loaded (pass --blob-store)")
 
     # Update metadata
     registry['skills'] = skills
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+HTML Extraction Backends
+
+Pluggable parsers for the few things the crawler reads from skills.sh pages:
+links with their surrounding text, the meta description, the text after the
+h1, and the install count.
+
+- "lxml": lxml.html (C parser) with XPath lookups, used by default when installed
+- "html.parser": BeautifulSoup with Python's html.parser, the fallback
+
+The install count is found by visiting only the text nodes that mention
+install/download/use, instead of regex-scanning the text of the whole page.
+
+extract_embedded_skills() reads the JSON that listing pages already embed
+(JSON-LD, __NEXT_DATA__, Next.js flight data) so descriptions, installs and
+ranks can be filled in bulk without fetching each skill page.
+
+Usage:
+    import html_extract
+
+    html_extract.select_parser("auto")   # or "lxml" / "html.parser"
+    fields = html_extract.get_backend().skill_page(html)
+    links = html_extract.get_backend().links(html)
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+INSTALL_COUNT_RE = re.compile(r'(\d+(?:\.\d+)?[KkMm]?)\s*(?:install|download|use)')
+INSTALL_WORD_RE = re.compile(r'install|download|use')
+DESCRIPTION_META_SELECTORS = ["meta[property='og:description']", "meta[name='description']"]
+
+
+@dataclass
+class SkillPageFields:
+    """Raw values pulled from a skill page, before any interpretation"""
+    meta_description: str = ""
+    h1_sibling_texts: list[str] = field(default_factory=list)  # Only filled when there is no meta description
+    install_text: Optional[str] = None
+
+
+def match_install_count(previous: Optional[str], text: str) -> Optional[str]:
+    """Install count in a text node, or spanning it and the text node before it"""
+    match = INSTALL_COUNT_RE.search(text)
+    if not match and previous:
+        match = INSTALL_COUNT_RE.search(previous + text)
+    return match.group(1) if match else None
+
+
+class SoupBackend:
+    """BeautifulSoup on Python's html.parser"""
+    name = "html.parser"
+
+    def skill_page(self, html: str, ignore_descriptions: set = frozenset()) -> SkillPageFields:
+        soup = BeautifulSoup(html, "html.parser")
+        fields = SkillPageFields()
+
+        for selector in DESCRIPTION_META_SELECTORS:
+            meta = soup.select_one(selector)
+            content = meta.get("content", "") if meta else ""
+            if content and content not in ignore_descriptions:
+                fields.meta_description = content
+                break
+
+        h1 = soup.find("h1")
+        if h1 and not fields.meta_description:
+            fields.h1_sibling_texts = [s.get_text(strip=True) for s in h1.find_next_siblings()]
+
+        # Walk text nodes lazily and stop at the first count
+        previous = None
+        for text in soup.strings:
+            if INSTALL_WORD_RE.search(text):
+                fields.install_text = match_install_count(previous, text)
+                if fields.install_text:
+                    break
+            previous = text
+        return fields
+
+    def links(self, html: str) -> list[tuple[str, str]]:
+        """(href, text of the link's parent) for every <a href>"""
+        soup = BeautifulSoup(html, "html.parser")
+        result = []
+        for link in soup.find_all("a", href=True):
+            parent = link.parent
+            parent_text = parent.get_text(separator=" ", strip=True) if parent else ""
+            result.append((link.get("href", ""), parent_text))
+        return result
+
+
+class LxmlBackend:
+    """lxml.html with XPath; script and style text is skipped like get_text() does"""
+    name = "lxml"
+
+    TEXT = "text()[not(ancestor::script) and not(ancestor::style)]"
+
+    def _texts(self, element) -> list[str]:
+        return element.xpath(".//" + self.TEXT)
+
+    def skill_page(self, html: str, ignore_descriptions: set = frozenset()) -> SkillPageFields:
+        root = lxml.html.fromstring(html)
+        fields = SkillPageFields()
+
+        for xpath in ("//meta[@property='og:description']/@content", "//meta[@name='description']/@content"):
+            values = root.xpath(xpath)
+            if values and values[0] and values[0] not in ignore_descriptions:
+                fields.meta_description = values[0]
+                break
+
+        if not fields.meta_description:
+            h1 = root.find(".//h1")
+            if h1 is not None:
+                fields.h1_sibling_texts = [
+                    "".join(t.strip() for t in self._texts(sibling))
+                    for sibling in h1.itersiblings()
+                ]
+
+        # Text nodes in document order; only the ones naming a keyword are matched
+        texts = self._texts(root)
+        for i, text in enumerate(texts):
+            if not INSTALL_WORD_RE.search(text):
+                continue
+            fields.install_text = match_install_count(texts[i - 1] if i else None, text)
+            if fields.install_text:
+                break
+        return fields
+
+    def links(self, html: str) -> list[tuple[str, str]]:
+        """(href, text of the link's parent) for every <a href>"""
+        root = lxml.html.fromstring(html)
+        result = []
+        for link in root.iter("a"):
+            href = link.get("href")
+            if href is None:
+                continue
+            parent = link.getparent()
+            parent_text = ""
+            if parent is not None:
+                parent_text = " ".join(t.strip() for t in self._texts(parent) if t.strip())
+            result.append((href, parent_text))
+        return result
+
+
+BACKENDS = {"lxml": LxmlBackend, "html.parser": SoupBackend}
+PARSER_PREFERENCE = ["lxml", "html.parser"]  # Fastest first; "auto" uses the first one installed
+
+_backend = None
+
+
+def available_parsers() -> list[str]:
+    """Backends from PARSER_PREFERENCE that can run here"""
+    return [name for name in PARSER_PREFERENCE if name != "lxml" or lxml is not None]
+
+
+def select_parser(name: str = "auto"):
+    """Choose the backend used by get_backend(). Returns it."""
+    global _backend
+    available = available_parsers()
+    if name == "auto":
+        name = available[0]
+    elif name not in available:
+        raise ValueError(f"HTML parser '{name}' is not available (have: {', '.join(available)})")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def get_backend():
+    """Backend in use, picking one on first call"""
+    return _backend or select_parser("auto")
+
+
+# Structured data embedded in listing pages
+
+SKILL_PATH_RE = re.compile(r'^(?:https?://skills\.sh)?/([^/?#]+)/([^/?#]+)/([^/?#]+)/?$')
+SCRIPT_RE = re.compile(r'<script([^>]*)>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+NEXT_FLIGHT_RE = re.compile(r'self\.__next_f\.push\((\[.*?\])\)\s*;?\s*$', re.DOTALL)
+INSTALL_KEYS = ["installs", "installCount", "install_count", "downloads"]
+RANK_KEYS = ["rank", "position"]
+SLUG_KEYS = ["skillId", "skill_slug", "slug", "skill"]
+
+
+def _json_payloads(html: str):
+    """Yield parsed JSON from JSON-LD, __NEXT_DATA__ and Next.js flight scripts"""
+    for attrs, body in SCRIPT_RE.findall(html):
+        body = body.strip()
+        if not body:
+            continue
+        if "application/ld+json" in attrs or "application/json" in attrs:
+            try:
+                yield json.loads(body)
+            except ValueError:
+                pass
+            continue
+        match = NEXT_FLIGHT_RE.search(body)
+        if not match:
+            continue
+        try:
+            chunk = json.loads(match.group(1))
+        except ValueError:
+            continue
+        if len(chunk) < 2 or not isinstance(chunk[1], str):
+            continue
+        # Flight rows look like "id:JSON"
+        for row in chunk[1].splitlines():
+            _, _, value = row.partition(":")
+            if value[:1] in ("[", "{"):
+                try:
+                    yield json.loads(value)
+                except ValueError:
+                    pass
+
+
+def _key_from_parts(owner, repo, slug) -> Optional[str]:
+    """owner/repo/slug when each part is a non-empty string without a slash, else None"""
+    parts = (owner, repo, slug)
+    if all(isinstance(part, str) and part and "/" not in part for part in parts):
+        return "/".join(parts)
+    return None
+
+
+def _skill_key_of(node: dict) -> Optional[str]:
+    """owner/repo/slug for a dict that describes a skill, else None"""
+    for key in ("url", "href", "@id", "path"):
+        value = node.get(key)
+        if isinstance(value, str):
+            match = SKILL_PATH_RE.match(value)
+            if match:
+                return "/".join(match.groups())
+    slug = next((node[k] for k in SLUG_KEYS if isinstance(node.get(k), str) and node[k]), "")
+    if not slug:
+        return None
+    source = node.get("source") or node.get("repository") or ""
+    if isinstance(source, str) and source.count("/") == 1:
+        return _key_from_parts(*source.split("/"), slug)
+    return _key_from_parts(node.get("owner"), node.get("repo"), slug)
+
+
+def _install_count_of(node: dict) -> int:
+    for key in INSTALL_KEYS:
+        value = node.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return int(value)
+    stats = node.get("interactionStatistic")
+    for stat in stats if isinstance(stats, list) else [stats]:
+        if isinstance(stat, dict) and isinstance(stat.get("userInteractionCount"), (int, float)):
+            return int(stat["userInteractionCount"])
+    return 0
+
+
+def _walk(node, found: dict, rank: int = 0) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, found)
+        return
+    if not isinstance(node, dict):
+        return
+
+    # JSON-LD ListItem: the position sits on the wrapper, the skill on "item"
+    position = next((node[k] for k in RANK_KEYS if isinstance(node.get(k), int)), rank)
+    item = node.get("item")
+    if isinstance(item, dict):
+        _walk(item, found, position)
+
+    key = _skill_key_of(node)
+    if key:
+        entry = found.setdefault(key, {"description": "", "installs": 0, "rank": 0})
+        description = node.get("description")
+        if isinstance(description, str) and description and not entry["description"]:
+            entry["description"] = description
+        entry["installs"] = entry["installs"] or _install_count_of(node)
+        entry["rank"] = entry["rank"] or position
+
+    for value in node.values():
+        if isinstance(value, (dict, list)) and value is not item:
+            _walk(value, found)
+
+
+def extract_embedded_skills(html: str) -> dict[str, dict]:
+    """
+    Skill metadata from structured data embedded in a listing page.
+
+    Looks through JSON-LD, __NEXT_DATA__ and Next.js flight payloads for
+    objects that identify a skill (a skills.sh URL, or source/owner+repo plus
+    a slug). Returns {"owner/repo/slug": {"description", "installs", "rank"}};
+    fields that were not present are left empty or 0.
+    """
+    found = {}
+    for payload in _json_payloads(html):
+        _walk(payload, found)
+    return found
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Cache
+
+SQLite-backed cache of GET responses that survives between runs. Cached
+entries are revalidated with If-None-Match / If-Modified-Since, and a
+304 Not Modified is served from the stored body, so a nightly re-crawl costs
+mostly 304s (which GitHub does not count against the rate limit).
+
+- Only 200 responses carrying an ETag or Last-Modified are stored
+- Bodies are zlib-compressed
+- Eviction by age (max_age seconds since last validation) and by total size
+  (least recently used first, down to max_bytes)
+
+Usage:
+    import http_cache
+
+    http_cache.enable("crawl_cache.sqlite")
+    response = http_cache.get(url)   # falls back to http_client.get if disabled
+    print(http_cache.stats())
+    http_cache.disable()
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+import requests
+
+import http_client
+from metrics import METRICS
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB of compressed bodies
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # Drop entries not revalidated for 30 days
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class HttpCache:
+    """Conditional-request cache stored in a single SQLite file"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._db.commit()
+        self.evict()
+
+    def _lookup(self, url: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, content_type, encoding, body FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 response.headers.get("Content-Type"), response.encoding,
+                 body, len(body), now, now)
+            )
+            self._db.commit()
+
+    def _touch(self, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET validated_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._db.commit()
+
+    def _forget(self, url: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._db.commit()
+
+    def get(self, url: str, headers: dict = None, **kwargs) -> requests.Response:
+        """
+        GET url, revalidating any cached copy.
+
+        A 304 is turned back into a 200 response built from the cached body,
+        with from_cache set to True.
+        """
+        cached = self._lookup(url)
+        headers = dict(headers or {})
+        if cached:
+            etag, last_modified = cached[0], cached[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = http_client.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached:
+            self.hits += 1
+            METRICS.record_cache(hit=True)
+            self._touch(url)
+            return self._build_response(url, cached)
+
+        self.misses += 1
+        METRICS.record_cache(hit=False)
+        response.from_cache = False
+        if response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self._store(url, response)
+        elif cached and response.status_code == 404:
+            self._forget(url)
+        return response
+
+    @staticmethod
+    def _build_response(url: str, cached: tuple) -> requests.Response:
+        _, _, content_type, encoding, body = cached
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = zlib.decompress(body)
+        response.encoding = encoding
+        if content_type:
+            response.headers["Content-Type"] = content_type
+        response.from_cache = True
+        return response
+
+    def evict(self) -> int:
+        """Drop entries older than max_age, then LRU entries above max_bytes. Returns rows removed."""
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM responses WHERE validated_at < ?",
+                (time.time() - self.max_age,)
+            ).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._db.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    total -= size
+                    removed += 1
+            self._db.commit()
+        return removed
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this run plus current cache size"""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        requests_made = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests_made if requests_made else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        self.evict()
+        with self._lock:
+            self._db.close()
+
+
+_active: Optional[HttpCache] = None
+
+
+def enable(path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE) -> HttpCache:
+    """Open the cache at path and route get() through it"""
+    global _active
+    disable()
+    _active = HttpCache(path, max_bytes=max_bytes, max_age=max_age)
+    return _active
+
+
+def disable() -> None:
+    """Close the active cache, if any"""
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the active cache, or straight through http_client when disabled"""
+    if _active is None:
+        return http_client.get(url, **kwargs)
+    return _active.get(url, **kwargs)
+
+
+def stats() -> dict:
+    """Stats of the active cache (empty when disabled)"""
+    return _active.stats() if _active else {}
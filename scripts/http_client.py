@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+
+One pooled requests.Session for all scripts/ tools, so repeated requests to
+the same host reuse keep-alive connections instead of opening a new TCP+TLS
+handshake per URL.
+
+- Connection pools per host (pool_connections hosts, pool_maxsize sockets each)
+- Retries with jittered exponential backoff on connection errors and 429/5xx
+- Uniform default timeouts
+- Per-host token-bucket throttling that follows rate-limit headers (rate_limit.py)
+- Every attempt and retry is recorded in the shared metrics collector (metrics.py)
+
+Usage:
+    import http_client
+
+    response = http_client.get(url)
+    exists = http_client.head(url).status_code == 200
+
+    # Optional, before the first request (e.g. for a concurrent crawl)
+    http_client.configure(pool_maxsize=32)
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import rate_limit
+from metrics import METRICS
+
+
+# Defaults
+USER_AGENT = "RalphySkillsTools/1.0"
+DEFAULT_TIMEOUT = (5, 20)  # (connect, read) seconds
+POOL_CONNECTIONS = 32  # Number of per-host pools kept
+POOL_MAXSIZE = 16  # Keep-alive connections per host
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # Seconds, doubled each attempt
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS"}  # Idempotent methods retried by default
+
+_settings = {
+    "pool_connections": POOL_CONNECTIONS,
+    "pool_maxsize": POOL_MAXSIZE,
+    "max_retries": MAX_RETRIES,
+    "timeout": DEFAULT_TIMEOUT,
+    "user_agent": USER_AGENT,
+}
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def configure(pool_connections: int = None, pool_maxsize: int = None,
+              max_retries: int = None, timeout=None, user_agent: str = None) -> None:
+    """Change client settings; the session is rebuilt on the next request"""
+    global _session
+    updates = {
+        "pool_connections": pool_connections,
+        "pool_maxsize": pool_maxsize,
+        "max_retries": max_retries,
+        "timeout": timeout,
+        "user_agent": user_agent,
+    }
+    with _lock:
+        for key, value in updates.items():
+            if value is not None:
+                _settings[key] = value
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in request() so they get jittered backoff
+                adapter = HTTPAdapter(
+                    pool_connections=_settings["pool_connections"],
+                    pool_maxsize=_settings["pool_maxsize"],
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = _settings["user_agent"]
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(method: str, url: str, retries: int = None, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session.
+
+    Each attempt waits for the host's rate limiter first. Connection errors,
+    timeouts and retryable statuses are retried for idempotent methods. After
+    the last attempt, a retryable status response is returned as-is and a
+    connection error is re-raised.
+    """
+    method = method.upper()
+    if retries is None:
+        retries = _settings["max_retries"] if method in RETRY_METHODS else 0
+    kwargs.setdefault("timeout", _settings["timeout"])
+
+    attempt = 0
+    while True:
+        rate_limit.LIMITER.acquire(url)
+        start = time.perf_counter()
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            METRICS.record_request(url, "error", time.perf_counter() - start)
+            if attempt >= retries:
+                raise
+        else:
+            # Streamed bodies are not read here; count their declared length instead
+            if kwargs.get("stream"):
+                size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(response.content)
+            METRICS.record_request(url, response.status_code, time.perf_counter() - start, size)
+            rate_limit.LIMITER.observe(url, response)
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+            response.close()
+        METRICS.record_retry(url)
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared session"""
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    """HEAD through the shared session (redirects not followed, like requests.head)"""
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared session (not retried unless retries is given)"""
+    return request("POST", url, **kwargs)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Skill Identity Index
+
+Persisted alias -> canonical skill id map, so every merge and import stage
+agrees on when two records are the same skill. The stages used to key on
+different things (merge_and_validate on id or an MD5 of the source URL,
+finalize_registry on owner/repo/skill_slug, the crawler on a fresh UUID
+per run), so one skill could come through twice under different keys.
+
+A record's aliases:
+    id:<id>                      its id, whatever scheme produced it
+    slug:<owner>/<repo>/<slug>   lowercased
+    path:<owner>/<repo>/<dir>    the skill's directory in the repo, from the
+                                 GitHub source URL (tree/blob links) or from
+                                 skill_md_url (github.com or raw links); only
+                                 below the repo root, since a bare repo URL or
+                                 a root SKILL.md fallback is shared by every
+                                 skill in a multi-skill repo
+
+Resolving a record looks all of its aliases up by primary key. The first
+one already known (in the order above) gives the canonical id; otherwise the
+record's own id becomes canonical. Every alias of the record is then
+registered under that id, so a later record matching on any of them
+resolves to the same skill. Aliases already bound to another id are left
+alone and counted as conflicts. An id a record already has is never
+replaced: the canonical id is the dedup key, and is only assigned to
+records without one.
+
+Ids made up for a single run (the crawler's uuid4 for a skill it has not
+seen) must not become canonical, so such callers resolve with
+register=False: a lookup that writes nothing. An authoritative source (the
+published registry) is seeded first, binding its aliases to its own ids, so
+everything matched later resolves to the ids the API already uses.
+
+Usage:
+    from identity import IdentityIndex
+
+    with IdentityIndex("identity.sqlite") as index:
+        index.seed(registry_record)           # registry ids win
+        skill_id = index.resolve(record)      # sets record["id"] if it has none
+        known = index.resolve(record, register=False)  # lookup only
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Optional
+
+from metrics import METRICS
+
+
+DEFAULT_DB = "identity.sqlite"
+COMMIT_EVERY = 1000  # Alias inserts per transaction
+
+GITHUB_URL_PATTERN = re.compile(
+    r'^(?:https?://)?(?:www\.)?github\.com/([^/\s?#]+)/([^/\s?#]+)(?:/(?:tree|blob)/[^/\s?#]+(/[^\s?#]*)?)?',
+    re.IGNORECASE
+)
+RAW_URL_PATTERN = re.compile(
+    r'^(?:https?://)?raw\.githubusercontent\.com/([^/\s?#]+)/([^/\s?#]+)/[^/\s?#]+(/[^\s?#]*)?',
+    re.IGNORECASE
+)
+SKILL_MD_NAME = re.compile(r'/skill\.md$', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    skill_id TEXT NOT NULL
+)
+"""
+
+
+def normalize_github_path(url: str) -> Optional[tuple[str, str, str]]:
+    """(owner, repo, path) for a github.com or raw.githubusercontent.com URL, lowercased; path may be ''"""
+    url = (url or "").strip()
+    match = GITHUB_URL_PATTERN.match(url) or RAW_URL_PATTERN.match(url)
+    if not match:
+        return None
+    owner, repo, path = match.group(1), match.group(2), match.group(3) or ""
+    if repo.lower().endswith(".git"):
+        repo = repo[:-4]
+    return owner.lower(), repo.lower(), path.strip("/").lower()
+
+
+def location_alias(url: str, skill_md: bool = False) -> Optional[str]:
+    """path: alias for a source URL or a SKILL.md URL (its directory), None at the repo root"""
+    parts = normalize_github_path(url)
+    if not parts:
+        return None
+    owner, repo, path = parts
+    if skill_md:
+        path = SKILL_MD_NAME.sub("", "/" + path).strip("/")
+    return f"path:{owner}/{repo}/{path}" if path else None
+
+
+def aliases(record: dict) -> list[str]:
+    """Every alias a record can be found under, in lookup priority order"""
+    found = []
+    if record.get("id"):
+        found.append(f"id:{record['id']}")
+    owner = (record.get("owner") or "").lower()
+    repo = (record.get("repo") or "").lower()
+    slug = (record.get("skill_slug") or "").lower()
+    if owner and repo and slug:
+        found.append(f"slug:{owner}/{repo}/{slug}")
+    for url, skill_md in ((record.get("source") or record.get("github_url") or record.get("gitUrl"), False),
+                          (record.get("skill_md_url"), True)):
+        alias = location_alias(url, skill_md) if url else None
+        if alias and alias not in found:
+            found.append(alias)
+    return found
+
+
+class IdentityIndex:
+    """Alias -> canonical skill id, in a SQLite file (or in memory when path is None)"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def lookup(self, alias: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT skill_id FROM aliases WHERE alias = ?", (alias,)).fetchone()
+        return row[0] if row else None
+
+    def matches(self, record: dict) -> set[str]:
+        """Every id any of the record's aliases is bound to (usually one, more on conflicts)"""
+        names = aliases(record)
+        if not names:
+            return set()
+        with self._lock:
+            placeholders = ",".join("?" * len(names))
+            rows = self._db.execute(
+                f"SELECT skill_id FROM aliases WHERE alias IN ({placeholders})", names
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def resolve(self, record: dict, assign: bool = True, register: bool = True) -> Optional[str]:
+        """
+        Canonical id for a record, registering all of its aliases.
+
+        With assign, a record without an id gets the canonical one; an id it
+        already has is kept. With register=False nothing is written, so a
+        record matching no alias gets its own id back without it becoming
+        canonical. Returns None for a record with no aliases at all.
+        """
+        names = aliases(record)
+        if not names:
+            return None
+        with self._lock:
+            placeholders = ",".join("?" * len(names))
+            known = dict(self._db.execute(
+                f"SELECT alias, skill_id FROM aliases WHERE alias IN ({placeholders})", names
+            ).fetchall())
+            canonical = next((known[name] for name in names if name in known), None)
+            if canonical is None:
+                canonical = record.get("id") or hashlib.md5(names[0].encode()).hexdigest()[:12]
+                METRICS.inc("identity_new")
+            else:
+                METRICS.inc("identity_matched")
+            if any(skill_id != canonical for skill_id in known.values()):
+                METRICS.inc("identity_conflicts")
+            new = [(name, canonical) for name in names if name not in known] if register else []
+            if new:
+                self._db.executemany("INSERT OR IGNORE INTO aliases VALUES (?, ?)", new)
+                self._pending += len(new)
+                if self._pending >= COMMIT_EVERY:
+                    self._db.commit()
+                    self._pending = 0
+        if assign and not record.get("id"):
+            record["id"] = canonical
+        return canonical
+
+    def seed(self, record: dict) -> Optional[str]:
+        """
+        Bind every alias of a record to its own id, replacing other bindings.
+
+        For the authoritative source (the published registry), so records
+        resolved afterwards match the ids it already uses. Returns the id,
+        or None for a record without one.
+        """
+        skill_id = record.get("id")
+        if not skill_id:
+            return None
+        names = aliases(record)
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+                                 [(name, skill_id) for name in names])
+            self._pending += len(names)
+            if self._pending >= COMMIT_EVERY:
+                self._db.commit()
+                self._pending = 0
+        METRICS.inc("identity_seeded")
+        return skill_id
+
+    def key(self, record: dict) -> Optional[str]:
+        """Dedup key for merge_sources.merge_streams: the canonical id (assigned only to id-less records)"""
+        return self.resolve(record)
+
+    def stats(self) -> dict:
+        with self._lock:
+            aliases_count, skills = self._db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT skill_id) FROM aliases"
+            ).fetchone()
+        return {"aliases": aliases_count, "skills": skills}
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -7,27 +7,47 @@ the skills into the database via the API.
 
 Usage:
     python import_skills_sh.py [--input skills_sh_crawled.json] [--api-url URL]
+    python import_skills_sh.py --input skills_sh_crawled.jsonl.gz
+    python import_skills_sh.py --input crawled.jsonl --blob-store skill_md_blobs
 """
 
 import json
 import argparse
 import requests
-import time
 from pathlib import Path
 
+import http_client
+import identity
+from blob_store import BlobStore, has_content, load_content
+from jsonl_io import read_records
+from metrics import METRICS, add_metrics_arguments, write_reports
+
 
 DEFAULT_API_URL = "https://ralphy-skills.ralphy-sh.workers.dev"
 # For local development: "http://localhost:8787"
 
 
 def load_crawled_data(input_path: str) -> list[dict]:
-    """Load crawled skills data from JSON file"""
-    with open(input_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def transform_skill_for_api(skill: dict) -> dict:
-    """Transform crawled skill data to match API expected format"""
+    """Load crawled skills data from a JSON or JSONL file"""
+    return list(read_records(input_path))
+
+
+def resolve_identities(skills: list[dict], identities: identity.IdentityIndex) -> list[dict]:
+    """Drop repeats of a skill already in the list (matched by canonical id); id-less skills get that id"""
+    seen = set()
+    unique = []
+    for skill in skills:
+        skill_id = identities.resolve(skill)
+        if skill_id is not None:
+            if skill_id in seen:
+                continue
+            seen.add(skill_id)
+        unique.append(skill)
+    return unique
+
+
+def transform_skill_for_api(skill: dict, store: BlobStore = None) -> dict:
+    """Transform crawled skill data to match API expected format (SKILL.md bodies by reference come from store)"""
     return {
         "id": skill.get("id"),
         "name": skill.get("name"),
@@ -48,17 +68,17 @@ def transform_skill_for_api(skill: dict) -> dict:
             "skill_slug": skill.get("skill_slug"),
             "skill_md_url": skill.get("skill_md_url", ""),
             "skillssh_rank": skill.get("skillssh_rank", 0),
-            "skill_md_content": skill.get("skill_md_content", "")[:5000],  # Limit content size
+            "skill_md_content": load_content(skill, store)[:5000],  # Limit content size
         }),
         "status": "published",
-        "is_verified": 1 if skill.get("skill_md_content") else 0,  # Verified if we have SKILL.md
+        "is_verified": 1 if has_content(skill) else 0,  # Verified if we have SKILL.md
     }
 
 
 def import_skill(api_url: str, skill_data: dict) -> tuple[bool, str]:
     """Import a single skill via the API"""
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{api_url}/api/skills",
             json=skill_data,
             headers={"Content-Type": "application/json"},
@@ -78,7 +98,7 @@ def import_skill(api_url: str, skill_data: dict) -> tuple[bool, str]:
 def import_skills_bulk(api_url: str, skills: list[dict], admin_token: str) -> tuple[bool, str]:
     """Import skills in bulk via the admin API"""
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{api_url}/api/admin/import",
             json={
                 "skills": skills,
@@ -117,6 +137,11 @@ def main():
                        help="Batch size for bulk import")
     parser.add_argument("--dry-run", "-d", action="store_true",
                        help="Don't actually import, just show what would be done")
+    parser.add_argument("--blob-store", default=None,
+                       help="Blob store directory for records that carry skill_md_sha256 references")
+    parser.add_argument("--identity", default=identity.DEFAULT_DB,
+                       help="SQLite file for the skill identity index (ids sent to the API are canonical)")
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
@@ -133,9 +158,14 @@ def main():
     
     print(f"Loaded {len(skills)} skills")
     
+    with identity.IdentityIndex(args.identity) as identities:
+        skills = resolve_identities(skills, identities)
+    print(f"Unique skills by identity: {len(skills)}")
+    
     # Transform data
     print("Transforming data for API...")
-    api_skills = [transform_skill_for_api(skill) for skill in skills]
+    store = BlobStore(args.blob_store) if args.blob_store else None
+    api_skills = [transform_skill_for_api(skill, store) for skill in skills]
     
     # Filter to only skills with content
     skills_with_md = [s for s in api_skills if s.get("is_verified")]
@@ -155,33 +185,36 @@ def main():
     imported = 0
     failed = 0
     
-    for i in range(0, len(api_skills), args.batch_size):
-        batch = api_skills[i:i + args.batch_size]
-        batch_num = i // args.batch_size + 1
-        total_batches = (len(api_skills) + args.batch_size - 1) // args.batch_size
-        
-        print(f"  Batch {batch_num}/{total_batches} ({len(batch)} skills)...", end=" ")
-        
-        success, message = import_skills_bulk(args.api_url, batch, args.admin_token)
-        
-        if success:
-            print(f"✓ {message}")
-            imported += len(batch)
-        else:
-            print(f"✗ {message}")
-            # Try individual import as fallback
-            for skill in batch:
-                success, msg = import_skill(args.api_url, skill)
-                if success:
-                    imported += 1
-                else:
-                    failed += 1
-        
-        time.sleep(0.5)  # Rate limiting
+    with METRICS.phase("import"):
+        for i in range(0, len(api_skills), args.batch_size):
+            batch = api_skills[i:i + args.batch_size]
+            batch_num = i // args.batch_size + 1
+            total_batches = (len(api_skills) + args.batch_size - 1) // args.batch_size
+            
+            print(f"  Batch {batch_num}/{total_batches} ({len(batch)} skills)...", end=" ")
+            
+            success, message = import_skills_bulk(args.api_url, batch, args.admin_token)
+            
+            if success:
+                print(f"✓ {message}")
+                imported += len(batch)
+            else:
+                print(f"✗ {message}")
+                # Try individual import as fallback
+                for skill in batch:
+                    success, msg = import_skill(args.api_url, skill)
+                    if success:
+                        imported += 1
+                    else:
+                        failed += 1
     
     print(f"\nImport complete!")
     print(f"  Imported: {imported}")
     print(f"  Failed: {failed}")
+    
+    METRICS.inc("skills_imported", imported)
+    METRICS.inc("skills_failed", failed)
+    write_reports(args, job="import_skills_sh")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Lines I/O
+
+Read and write skill records one at a time, so a stage never has to hold a
+whole registry (with every skill_md_content) in memory, and a later stage can
+read a file record by record instead of loading it whole.
+
+A JsonlWriter's output only appears at its path once the writer closes, so
+the next stage starts when the file is complete rather than tailing it while
+it is written; to overlap stages, chain their generators in one process.
+
+- Paths ending in .jsonl are JSON Lines; .jsonl.gz adds gzip
+- Any other path is treated as a legacy JSON document (a list, or an object
+  with a skills/plugins/packages/items list) so old artifacts still load
+- compact=True drops the spaces after separators
+
+Usage:
+    from jsonl_io import read_records, JsonlWriter
+
+    with JsonlWriter("skills.jsonl.gz") as out:
+        for record in read_records("skills_registry.json"):
+            out.write(record)
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+RECORD_KEYS = ["skills", "plugins", "packages", "items"]
+COMPACT_SEPARATORS = (",", ":")
+
+
+def is_jsonl(path: str) -> bool:
+    """Whether a path uses the JSON Lines format (optionally gzipped)"""
+    name = str(path).lower()
+    return name.endswith(".jsonl") or name.endswith(".jsonl.gz")
+
+
+def open_text(path: str, mode: str = "r"):
+    """Open a text file, transparently gzipped when the name ends in .gz"""
+    if str(path).lower().endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def extract_records(data) -> list[dict]:
+    """Pull the record list out of a legacy JSON document"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in RECORD_KEYS:
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Yield records from a JSONL file one at a time, or from a legacy JSON file"""
+    if not is_jsonl(path):
+        with open_text(path) as f:
+            yield from extract_records(json.load(f))
+        return
+    with open_text(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def dumps(record: dict, compact: bool = True) -> str:
+    """Encode one record as a single JSON line (without the newline)"""
+    separators = COMPACT_SEPARATORS if compact else None
+    return json.dumps(record, ensure_ascii=False, separators=separators)
+
+
+class JsonlWriter:
+    """
+    Write records to a JSONL file one at a time.
+
+    Output goes to a temporary file that replaces path on a clean close, so
+    a file can be rewritten from itself (read_records(p) -> JsonlWriter(p))
+    and readers never see a half-written file.
+    """
+
+    def __init__(self, path: str, compact: bool = True):
+        self.path = Path(path)
+        self.compact = compact
+        self.count = 0
+        # Prefix rather than suffix so the .gz extension still selects gzip
+        self._tmp = self.path.with_name(".tmp-" + self.path.name)
+        self._file = open_text(self._tmp, "w")
+
+    def write(self, record: dict) -> None:
+        self._file.write(dumps(record, self.compact) + "\n")
+        self.count += 1
+
+    def write_all(self, records: Iterable[dict]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        """Discard everything written so far"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_records(path: str, records: Iterable[dict], compact: bool = True) -> int:
+    """Stream records to a JSONL path. Returns the number written."""
+    with JsonlWriter(path, compact=compact) as out:
+        return out.write_all(records)
@@ -5,33 +5,32 @@ Merge and Validate Skills
 This script:
 1. Merges marketplace.json and claude-plugins.json into one unified file
 2. Deduplicates skills by id
-3. Validates GitHub URLs in chunks (owner/repo level first, then skill level)
+3. Validates GitHub URLs (each unique owner/repo once, concurrently)
 4. Removes entries with 404 URLs
 5. Saves the clean, merged file
 
 Usage:
-    python merge_and_validate.py [--chunk-size 50] [--output skills_registry.json]
+    python merge_and_validate.py [--workers 16] [--output skills_registry.json]
 """
 
 import json
 import argparse
-import requests
-import time
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from typing import Iterable, Optional
 import hashlib
 
+import http_client
+import identity
+import repo_status
+from jsonl_io import is_jsonl, write_records
+from merge_sources import KeyIndex, counted, id_key, merge_streams
+from metrics import METRICS, add_metrics_arguments, write_reports
+
 
 # Constants
 REQUEST_TIMEOUT = 5
-CHUNK_DELAY = 1.0  # Delay between chunks
-
-
-def load_json(path: str) -> dict | list:
-    """Load JSON file"""
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+DEFAULT_WORKERS = 16  # Concurrent repo checks
 
 
 def save_json(data, path: str):
@@ -40,19 +39,6 @@ def save_json(data, path: str):
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def extract_skills(data: dict | list) -> list[dict]:
-    """Extract skills from various JSON structures"""
-    if isinstance(data, list):
-        return data
-    
-    # Try common keys
-    for key in ['skills', 'plugins', 'packages', 'items']:
-        if key in data and isinstance(data[key], list):
-            return data[key]
-    
-    return []
-
-
 def get_github_info(skill: dict) -> tuple[str, str, str]:
     """Extract owner, repo, and source URL from skill - and update skill with extracted values"""
     owner = skill.get('owner', '')
@@ -83,49 +69,78 @@ def check_url(url: str) -> tuple[str, bool]:
     
     try:
         # Use HEAD request for efficiency
-        response = requests.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+        response = http_client.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
         return url, response.status_code == 200
     except:
         try:
             # Fallback to GET if HEAD fails
-            response = requests.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+            response = http_client.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
             return url, response.status_code == 200
         except:
             return url, False
 
 
 def validate_repo(owner: str, repo: str) -> bool:
-    """Check if a GitHub repo exists"""
-    if not owner or not repo:
-        return False
+    """Check if a GitHub repo exists (through the shared repo status cache)"""
+    return repo_status.repo_exists(owner, repo)
+
+
+def repo_key(owner: str, repo: str) -> str:
+    """Cache key for a repo; GitHub owner/repo names are case-insensitive"""
+    return f"{owner}/{repo}".lower()
+
+
+def validate_repos(repos: Iterable[tuple[str, str]], workers: int = DEFAULT_WORKERS,
+                   progress_every: int = 100) -> dict[str, bool]:
+    """
+    Check repos concurrently, each unique owner/repo once.
     
-    url = f"https://github.com/{owner}/{repo}"
-    _, valid = check_url(url)
-    return valid
+    Returns {repo_key: exists}.
+    """
+    unique = {}
+    for owner, repo in repos:
+        if owner and repo:
+            unique.setdefault(repo_key(owner, repo), (owner, repo))
+    
+    print(f"  Checking {len(unique)} unique repos ({workers} workers)...")
+    http_client.configure(pool_maxsize=max(http_client.POOL_MAXSIZE, workers))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(validate_repo, owner, repo): key for key, (owner, repo) in unique.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if len(results) % progress_every == 0 or len(results) == len(futures):
+                print(f"  Checked {len(results)}/{len(futures)} repos")
+    return results
 
 
-def validate_skills_chunk(skills: list[dict], check_skill_urls: bool = True) -> list[dict]:
+def validate_skills_chunk(skills: list[dict], check_skill_urls: bool = True,
+                          repo_cache: Optional[dict] = None) -> list[dict]:
     """
     Validate a chunk of skills.
     
+    repo_cache holds repo results already known (see validate_repos); repos
+    missing from it are checked here and added.
+    
     Returns list of valid skills.
     """
     valid_skills = []
-    repo_cache = {}  # Cache repo validation results
+    if repo_cache is None:
+        repo_cache = {}  # Cache repo validation results
     
     for skill in skills:
         owner, repo, source = get_github_info(skill)
         
         # Check repo first (cached)
-        repo_key = f"{owner}/{repo}"
+        key = repo_key(owner, repo)
         
-        if repo_key not in repo_cache:
+        if key not in repo_cache:
             if owner and repo:
-                repo_cache[repo_key] = validate_repo(owner, repo)
+                repo_cache[key] = validate_repo(owner, repo)
             else:
-                repo_cache[repo_key] = False if not source else None
+                repo_cache[key] = False if not source else None
         
-        repo_valid = repo_cache[repo_key]
+        repo_valid = repo_cache[key]
         
         # If repo is invalid, skip this skill
         if repo_valid is False:
@@ -142,78 +157,54 @@ def validate_skills_chunk(skills: list[dict], check_skill_urls: bool = True) ->
     return valid_skills
 
 
-def merge_skills(skills1: list[dict], skills2: list[dict]) -> list[dict]:
+def merge_skills(skills1: Iterable[dict], skills2: Iterable[dict],
+                 identities: Optional[identity.IdentityIndex] = None) -> list[dict]:
     """
-    Merge two skill lists, deduplicating by id.
+    Merge two skill sources, deduplicating by id.
     Also extracts and populates owner/repo from URLs.
     skills1 takes priority over skills2 for duplicates.
-    """
-    seen_ids = set()
-    merged = []
     
-    def process_skill(skill: dict) -> tuple[str, dict]:
-        """Process a skill - extract owner/repo and return id + skill"""
+    With an identity index, duplicates are matched by canonical id (any
+    known alias); merged skills keep their own id.
+    """
+    def process_skill(skill: dict) -> dict:
+        """Process a skill - extract owner/repo and make sure it has an id"""
         # Extract and update owner/repo from URL
         get_github_info(skill)
         
-        skill_id = skill.get('id', '')
-        if not skill_id:
+        if not skill.get('id', ''):
             # Generate ID from source URL
             source = skill.get('source', '') or skill.get('github_url', '') or skill.get('gitUrl', '')
             if source:
-                skill_id = hashlib.md5(source.encode()).hexdigest()[:12]
-                skill['id'] = skill_id
+                skill['id'] = hashlib.md5(source.encode()).hexdigest()[:12]
         
-        return skill_id, skill
-    
-    # Add from first list
-    for skill in skills1:
-        skill_id, skill = process_skill(skill)
-        if skill_id and skill_id not in seen_ids:
-            seen_ids.add(skill_id)
-            merged.append(skill)
+        return skill
     
-    # Add from second list (if not duplicate)
-    for skill in skills2:
-        skill_id, skill = process_skill(skill)
-        if skill_id and skill_id not in seen_ids:
-            seen_ids.add(skill_id)
-            merged.append(skill)
-    
-    return merged
+    # More sources: see merge_sources.py
+    with KeyIndex() as index:
+        key = identities.key if identities else id_key
+        return list(merge_streams([skills1, skills2], index, key=key, prepare=process_skill))
 
 
-def process_in_chunks(skills: list[dict], chunk_size: int, validate_skills: bool = True) -> list[dict]:
+def process_in_chunks(skills: list[dict], chunk_size: int, validate_skills: bool = True,
+                      workers: int = DEFAULT_WORKERS) -> list[dict]:
     """
-    Process skills in chunks with validation.
+    Validate skills at repo level.
+    
+    Every unique repo is checked once, workers at a time, then the results
+    are applied to all of that repo's skills. chunk_size sets how often
+    progress is reported.
     
     Returns validated skills list.
     """
     if not validate_skills:
         return skills
     
-    total = len(skills)
-    validated = []
+    repos = [get_github_info(skill)[:2] for skill in skills]
+    repo_cache = validate_repos(repos, workers, progress_every=chunk_size)
+    METRICS.inc("repos_checked", len(repo_cache))
     
-    for i in range(0, total, chunk_size):
-        chunk = skills[i:i + chunk_size]
-        chunk_num = i // chunk_size + 1
-        total_chunks = (total + chunk_size - 1) // chunk_size
-        
-        print(f"  Validating chunk {chunk_num}/{total_chunks} ({len(chunk)} skills)...")
-        
-        valid_chunk = validate_skills_chunk(chunk, check_skill_urls=False)  # Only check repo level
-        validated.extend(valid_chunk)
-        
-        removed = len(chunk) - len(valid_chunk)
-        if removed > 0:
-            print(f"    Removed {removed} invalid skills")
-        
-        # Delay between chunks
-        if i + chunk_size < total:
-            time.sleep(CHUNK_DELAY)
-    
-    return validated
+    return validate_skills_chunk(skills, check_skill_urls=False, repo_cache=repo_cache)  # Only check repo level
 
 
 def main():
@@ -223,13 +214,20 @@ def main():
     parser.add_argument("--plugins", "-p", default="claude-plugins.json",
                        help="Path to claude-plugins.json")
     parser.add_argument("--output", "-o", default="skills_registry.json",
-                       help="Output file path")
+                       help="Output file path (.jsonl / .jsonl.gz writes one skill per line)")
     parser.add_argument("--chunk-size", "-c", type=int, default=100,
-                       help="Chunk size for validation")
+                       help="Repos checked between progress lines")
+    parser.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS,
+                       help="Concurrent repo checks")
     parser.add_argument("--skip-validation", "-s", action="store_true",
                        help="Skip URL validation")
+    parser.add_argument("--identity", default=identity.DEFAULT_DB,
+                       help="SQLite file for the skill identity index shared by merge/import stages")
+    parser.add_argument("--repo-cache", default=repo_status.DEFAULT_DB,
+                       help="SQLite file for repo existence checks, shared with the other tools")
     parser.add_argument("--dry-run", "-d", action="store_true",
                        help="Don't save, just show stats")
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
@@ -240,26 +238,22 @@ def main():
     # Load files
     print("\n[1/4] Loading source files...")
     
-    marketplace_skills = []
-    plugins_skills = []
-    
-    if Path(args.marketplace).exists():
-        marketplace_data = load_json(args.marketplace)
-        marketplace_skills = extract_skills(marketplace_data)
-        print(f"  Loaded {len(marketplace_skills)} skills from {args.marketplace}")
-    else:
-        print(f"  Warning: {args.marketplace} not found")
-    
-    if Path(args.plugins).exists():
-        plugins_data = load_json(args.plugins)
-        plugins_skills = extract_skills(plugins_data)
-        print(f"  Loaded {len(plugins_skills)} skills from {args.plugins}")
-    else:
-        print(f"  Warning: {args.plugins} not found")
+    # Sources are read lazily, record by record, while they are merged
+    counts = {}
+    sources = []
+    for path in (args.marketplace, args.plugins):
+        if Path(path).exists():
+            sources.append(counted(path, counts))
+        else:
+            sources.append([])
+            print(f"  Warning: {path} not found")
     
     # Merge
     print("\n[2/4] Merging and deduplicating...")
-    merged = merge_skills(marketplace_skills, plugins_skills)
+    with METRICS.phase("merge"), identity.IdentityIndex(args.identity) as identities:
+        merged = merge_skills(sources[0], sources[1], identities)
+    for path, count in counts.items():
+        print(f"  Loaded {count} skills from {path}")
     print(f"  Merged total: {len(merged)} unique skills")
     
     # Validate
@@ -268,8 +262,12 @@ def main():
         print("  Skipping validation (--skip-validation)")
         validated = merged
     else:
-        validated = process_in_chunks(merged, args.chunk_size)
+        repo_status.enable(args.repo_cache)
+        with METRICS.phase("validate"):
+            validated = process_in_chunks(merged, args.chunk_size, workers=args.workers)
+        repo_status.disable()
         removed = len(merged) - len(validated)
+        METRICS.inc("skills_removed", removed)
         print(f"\n  Validation complete:")
         print(f"    Valid: {len(validated)}")
         print(f"    Removed: {removed}")
@@ -279,6 +277,10 @@ def main():
     
     if args.dry_run:
         print("  [DRY RUN] Would save to", args.output)
+    elif is_jsonl(args.output):
+        with METRICS.phase("save"):
+            write_records(args.output, validated)
+        print(f"  Saved {len(validated)} skills to {args.output}")
     else:
         # Create output structure
         output_data = {
@@ -290,7 +292,8 @@ def main():
             "skills": validated
         }
         
-        save_json(output_data, args.output)
+        with METRICS.phase("save"):
+            save_json(output_data, args.output)
         print(f"  Saved {len(validated)} skills to {args.output}")
     
     # Summary stats
@@ -308,6 +311,10 @@ def main():
     print("\nTop 10 owners:")
     for owner, count in top_owners:
         print(f"  {owner}: {count} skills")
+    
+    METRICS.inc("skills_merged", len(merged))
+    METRICS.inc("skills_valid", len(validated))
+    write_reports(args, job="merge_and_validate")
 
 
 if __name__ == "__main__":
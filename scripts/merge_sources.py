@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Merge Skill Sources
+
+N-way merge of skill sources (marketplace.json, claude-plugins.json, the
+skills.sh crawl, a new import, ...) into one deduplicated JSONL stream.
+Sources are given in priority order: when the same skill appears in several
+of them, the record from the earliest source wins. With --fill-missing the
+winner also takes any fields it is missing (empty or absent) from the
+records it beat.
+
+Every source is read one record at a time and the keys already seen live in
+a SQLite index on disk, so memory stays flat however large the sources get.
+Without --fill-missing records are written out as soon as they are accepted;
+with it, winners are staged in the index file and streamed out at the end.
+
+By default skills are matched by canonical id from the persisted identity
+index (identity.py), so a skill is recognised under any alias seen in this
+or an earlier run: id, owner/repo/slug, or its directory from the source URL
+or skill_md_url. Winners keep the id they have (only id-less records get the
+canonical one), so an existing primary key is never rewritten. --key slug
+matches by owner/repo/skill_slug (or id) and --key id by id alone, without
+the index.
+
+Usage:
+    python merge_sources.py marketplace.json claude-plugins.json skills_sh_crawled.jsonl -o merged.jsonl.gz
+    python merge_sources.py data/skills_registry.json new_import.jsonl -o merged.jsonl --fill-missing
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Callable, Iterable, Iterator, Optional
+
+import identity
+from jsonl_io import JsonlWriter, read_records
+from metrics import METRICS, add_metrics_arguments, write_reports
+
+
+COMMIT_EVERY = 5000  # Index inserts per transaction
+GITHUB_REPO_PATTERN = re.compile(r'github\.com/([^/]+)/([^/\?#]+)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS merge_keys (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS merge_records (
+    seq INTEGER PRIMARY KEY,
+    record TEXT NOT NULL
+);
+"""
+
+
+def source_url(skill: dict) -> str:
+    return skill.get('source', '') or skill.get('github_url', '') or skill.get('gitUrl', '')
+
+
+def get_skill_id(skill: dict) -> Optional[str]:
+    """Existing id, else a stable one from owner/repo/skill_slug or the source URL"""
+    skill_id = skill.get('id')
+    if skill_id:
+        return skill_id
+    owner = skill.get('owner', '')
+    repo = skill.get('repo', '')
+    slug = skill.get('skill_slug', '')
+    if owner and repo and slug:
+        return hashlib.md5(f"{owner}/{repo}/{slug}".encode()).hexdigest()[:12]
+    source = source_url(skill)
+    if source:
+        return hashlib.md5(source.encode()).hexdigest()[:12]
+    return None
+
+
+def prepare_record(skill: dict) -> dict:
+    """Fill owner/repo from the GitHub source URL and make sure there is an id"""
+    if not skill.get('owner') or not skill.get('repo'):
+        match = GITHUB_REPO_PATTERN.search(source_url(skill))
+        if match:
+            skill['owner'] = match.group(1)
+            skill['repo'] = match.group(2).replace('.git', '')
+    if not skill.get('id'):
+        skill_id = get_skill_id(skill)
+        if skill_id:
+            skill['id'] = skill_id
+    return skill
+
+
+def id_key(skill: dict) -> Optional[str]:
+    return skill.get('id') or None
+
+
+def slug_key(skill: dict) -> Optional[str]:
+    """owner/repo/skill_slug (case-insensitive), or the id when any part is missing"""
+    owner = (skill.get('owner') or '').lower()
+    repo = (skill.get('repo') or '').lower()
+    slug = (skill.get('skill_slug') or '').lower()
+    if owner and repo and slug:
+        return f"{owner}/{repo}/{slug}"
+    skill_id = skill.get('id')
+    return f"id:{skill_id}" if skill_id else None
+
+
+KEY_FUNCS = {"slug": slug_key, "id": id_key}
+
+
+class KeyIndex:
+    """
+    Dedup keys in a SQLite file, each mapped to the sequence number of the
+    record that claimed it. With keep_records, accepted records are stored
+    too so they can be updated and streamed out later.
+    """
+
+    def __init__(self, path: str = None, keep_records: bool = False):
+        self._tmp = None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="merge-index-", suffix=".sqlite")
+            os.close(fd)
+            self._tmp = path
+        self.path = path
+        self.keep_records = keep_records
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")  # Scratch data; rebuilt if a run dies
+        self._db.executescript(SCHEMA)
+        self._db.execute("DELETE FROM merge_keys")  # An index is only valid for the run that built it
+        self._db.execute("DELETE FROM merge_records")
+        self.next_seq = 1
+        self._pending = 0
+
+    def claim(self, key: str) -> tuple[bool, int]:
+        """(True, new seq) if key was unseen, else (False, seq of the record that claimed it)"""
+        row = self._db.execute("SELECT seq FROM merge_keys WHERE key = ?", (key,)).fetchone()
+        if row:
+            return False, row[0]
+        seq = self.next_seq
+        self.next_seq += 1
+        self._db.execute("INSERT INTO merge_keys VALUES (?, ?)", (key, seq))
+        self._tick()
+        return True, seq
+
+    def add_record(self, seq: int, record: dict) -> None:
+        if self.keep_records:
+            self._db.execute("INSERT INTO merge_records VALUES (?, ?)",
+                             (seq, json.dumps(record, ensure_ascii=False)))
+            self._tick()
+
+    def get_record(self, seq: int) -> Optional[dict]:
+        row = self._db.execute("SELECT record FROM merge_records WHERE seq = ?", (seq,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_record(self, seq: int, record: dict) -> None:
+        self._db.execute("UPDATE merge_records SET record = ? WHERE seq = ?",
+                         (json.dumps(record, ensure_ascii=False), seq))
+        self._tick()
+
+    def records(self) -> Iterator[dict]:
+        """Stored records in the order they were accepted"""
+        self._db.commit()
+        for (record,) in self._db.execute("SELECT record FROM merge_records ORDER BY seq"):
+            yield json.loads(record)
+
+    def _tick(self) -> None:
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+        if self._tmp:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.unlink(self._tmp + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def fill_missing(winner: dict, other: dict) -> bool:
+    """Copy fields the winner lacks from a lower-priority duplicate; True if anything changed"""
+    changed = False
+    for field, value in other.items():
+        if value not in (None, "", [], {}) and winner.get(field) in (None, "", [], {}):
+            winner[field] = value
+            changed = True
+    return changed
+
+
+def merge_streams(sources: Iterable[Iterable[dict]], index: KeyIndex,
+                  key: Callable[[dict], Optional[str]] = slug_key,
+                  prepare: Callable[[dict], dict] = prepare_record,
+                  fill: bool = False) -> Iterator[dict]:
+    """
+    Yield the deduplicated union of sources, earlier sources winning.
+
+    Records with no key are dropped. With fill=True (which needs an index
+    with keep_records) nothing is yielded until every source is read.
+    """
+    for source in sources:
+        for record in source:
+            record = prepare(record)
+            record_key = key(record)
+            if not record_key:
+                METRICS.inc("records_without_key")
+                continue
+            new, seq = index.claim(record_key)
+            if new:
+                index.add_record(seq, record)
+                METRICS.inc("records_merged")
+                if not fill:
+                    yield record
+                continue
+            METRICS.inc("duplicates_dropped")
+            if fill:
+                winner = index.get_record(seq)
+                if winner is not None and fill_missing(winner, record):
+                    index.update_record(seq, winner)
+                    METRICS.inc("records_filled")
+    if fill:
+        yield from index.records()
+
+
+def counted(path: str, counts: dict) -> Iterator[dict]:
+    """read_records(path), tallying records read per source"""
+    counts[path] = 0
+    for record in read_records(path):
+        counts[path] += 1
+        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge skill sources (highest priority first) into one JSONL file")
+    parser.add_argument("sources", nargs="+",
+                       help="Source files (.json, .jsonl, .jsonl.gz), highest priority first")
+    parser.add_argument("--output", "-o", required=True,
+                       help="Merged output (.jsonl or .jsonl.gz)")
+    parser.add_argument("--key", "-k", choices=["identity"] + sorted(KEY_FUNCS), default="identity",
+                       help="How duplicates are matched")
+    parser.add_argument("--identity", default=identity.DEFAULT_DB,
+                       help="SQLite file for the skill identity index (--key identity)")
+    parser.add_argument("--fill-missing", "-f", action="store_true",
+                       help="Fill fields the winning record lacks from lower-priority duplicates")
+    parser.add_argument("--index", default=None,
+                       help="SQLite file for the key index (default: a temporary file; an existing one is reset)")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    missing = [path for path in args.sources if not os.path.exists(path)]
+    if missing:
+        parser.error(f"source not found: {', '.join(missing)}")
+
+    print("=" * 60)
+    print("Merge Skill Sources")
+    print("=" * 60)
+
+    counts = {}
+    identities = identity.IdentityIndex(args.identity) if args.key == "identity" else None
+    key = identities.key if identities else KEY_FUNCS[args.key]
+    try:
+        with METRICS.phase("merge"), KeyIndex(args.index, keep_records=args.fill_missing) as index:
+            merged = merge_streams((counted(path, counts) for path in args.sources), index,
+                                   key=key, fill=args.fill_missing)
+            with JsonlWriter(args.output) as out:
+                written = out.write_all(merged)
+    finally:
+        if identities:
+            identities.close()
+
+    for path in args.sources:
+        print(f"  {path}: {counts.get(path, 0)} records")
+    counters = METRICS.report()["counters"]
+    print(f"\n  Merged: {written} skills -> {args.output}")
+    print(f"  Duplicates dropped: {counters.get('duplicates_dropped', 0)}")
+    if args.fill_missing:
+        print(f"  Winners filled from duplicates: {counters.get('records_filled', 0)}")
+    if identities:
+        print(f"  Identity index: {counters.get('identity_matched', 0)} matched, "
+              f"{counters.get('identity_new', 0)} new, {counters.get('identity_conflicts', 0)} conflicts")
+
+    write_reports(args, job="merge_sources")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+
+One collector shared by the crawler, validators and importers. http_client
+and http_cache feed it automatically; scripts only mark their phases and
+choose where to write the report.
+
+Recorded:
+- Wall time per phase
+- Requests per host, by status code ("error" for connection failures)
+- Bytes received per host
+- Latency percentiles (p50/p90/p99) per host
+- Retries per host, HTTP cache hits and misses, and free-form counters
+
+Reports are a JSON document and a Prometheus textfile (for node_exporter's
+textfile collector), both written atomically.
+
+Usage:
+    from metrics import METRICS, add_metrics_arguments, write_reports
+
+    add_metrics_arguments(parser)
+    with METRICS.phase("fetch"):
+        ...
+    write_reports(args, job="crawl_skills_sh")
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+PROMETHEUS_PREFIX = "skills_pipeline"
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Metrics:
+    """Thread-safe in-process metrics collector"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.phases: dict[str, float] = {}
+            self.status_counts: dict[str, dict[str, int]] = {}
+            self.bytes_by_host: dict[str, int] = {}
+            self.latencies: dict[str, list[float]] = {}
+            self.retries: dict[str, int] = {}
+            self.cache = {"hit": 0, "miss": 0}
+            self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; repeated phases with the same name add up"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def record_request(self, url: str, status, latency: float, size: int = 0) -> None:
+        """One HTTP attempt: status code (or "error"), seconds taken and bytes received"""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            by_status = self.status_counts.setdefault(host, {})
+            by_status[str(status)] = by_status.get(str(status), 0) + 1
+            self.bytes_by_host[host] = self.bytes_by_host.get(host, 0) + size
+            self.latencies.setdefault(host, []).append(latency)
+
+    def record_retry(self, url: str) -> None:
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            self.retries[host] = self.retries.get(host, 0) + 1
+
+    def record_cache(self, hit: bool) -> None:
+        with self._lock:
+            self.cache["hit" if hit else "miss"] += 1
+
+    def inc(self, name: str, value: int = 1) -> None:
+        """Bump a free-form counter (e.g. skills_with_md)"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """Snapshot of everything recorded, as plain JSON-ready data"""
+        with self._lock:
+            hosts = {}
+            for host, by_status in self.status_counts.items():
+                latencies = sorted(self.latencies.get(host, []))
+                hosts[host] = {
+                    "requests": sum(by_status.values()),
+                    "status_codes": dict(by_status),
+                    "bytes": self.bytes_by_host.get(host, 0),
+                    "retries": self.retries.get(host, 0),
+                    "latency_seconds": {f"p{int(q * 100)}": percentile(latencies, q) for q in QUANTILES},
+                }
+            lookups = self.cache["hit"] + self.cache["miss"]
+            return {
+                "started_at": self.started_at,
+                "wall_seconds": time.time() - self.started_at,
+                "phases_seconds": dict(self.phases),
+                "requests_total": sum(h["requests"] for h in hosts.values()),
+                "bytes_total": sum(h["bytes"] for h in hosts.values()),
+                "retries_total": sum(self.retries.values()),
+                "hosts": hosts,
+                "cache": {
+                    "hits": self.cache["hit"],
+                    "misses": self.cache["miss"],
+                    "hit_ratio": self.cache["hit"] / lookups if lookups else 0.0,
+                },
+                "counters": dict(self.counters),
+            }
+
+    def prometheus_text(self, job: str) -> str:
+        """Report in the Prometheus text exposition format"""
+        data = self.report()
+        p = PROMETHEUS_PREFIX
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for labels, value in samples:
+                labels = {"job": job, **labels}
+                rendered = ",".join(f'{k}="{str(v)}"' for k, v in labels.items())
+                lines.append(f"{p}_{name}{{{rendered}}} {value}")
+
+        hosts = data["hosts"]
+        metric("phase_duration_seconds", "gauge", "Wall time spent in each pipeline phase.",
+               [({"phase": name}, round(seconds, 6)) for name, seconds in data["phases_seconds"].items()])
+        metric("requests_total", "counter", "HTTP requests by host and status code.",
+               [({"host": host, "status": status}, count)
+                for host, h in hosts.items() for status, count in h["status_codes"].items()])
+        metric("response_bytes_total", "counter", "Response bytes received by host.",
+               [({"host": host}, h["bytes"]) for host, h in hosts.items()])
+        metric("retries_total", "counter", "Retried HTTP requests by host.",
+               [({"host": host}, h["retries"]) for host, h in hosts.items()])
+        metric("request_latency_seconds", "summary", "HTTP request latency by host.",
+               [({"host": host, "quantile": str(q)}, round(h["latency_seconds"][f"p{int(q * 100)}"], 6))
+                for host, h in hosts.items() for q in QUANTILES])
+        metric("cache_lookups_total", "counter", "HTTP cache lookups by result.",
+               [({"result": "hit"}, data["cache"]["hits"]), ({"result": "miss"}, data["cache"]["misses"])])
+        metric("items_total", "counter", "Pipeline item counters.",
+               [({"name": name}, value) for name, value in data["counters"].items()])
+        metric("last_run_timestamp_seconds", "gauge", "When this run finished.",
+               [({}, round(time.time(), 3))])
+        return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str) -> None:
+    target = Path(path)
+    tmp = target.with_name(".tmp-" + target.name)
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, target)
+
+
+METRICS = Metrics()
+
+
+def add_metrics_arguments(parser) -> None:
+    """Add --metrics-json / --metrics-prom to a script's argument parser"""
+    parser.add_argument("--metrics-json", default=None,
+                       help="Write a JSON metrics report to this path")
+    parser.add_argument("--metrics-prom", default=None,
+                       help="Write a Prometheus textfile to this path")
+
+
+def write_reports(args, job: str) -> None:
+    """Write whichever metrics reports were requested on the command line (notes go to stderr, so --json output stays clean)"""
+    if getattr(args, "metrics_json", None):
+        _write_atomic(args.metrics_json, json.dumps({"job": job, **METRICS.report()}, indent=2) + "\n")
+        print(f"Metrics report written to {args.metrics_json}", file=sys.stderr)
+    if getattr(args, "metrics_prom", None):
+        _write_atomic(args.metrics_prom, METRICS.prometheus_text(job))
+        print(f"Prometheus metrics written to {args.metrics_prom}", file=sys.stderr)
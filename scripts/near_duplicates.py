@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Skill Detection
+
+Finds forks and re-published copies of the same skill that exact-key dedup
+(identity.py) lets through because they live under another owner/repo.
+
+Each record's description and SKILL.md body are cut into word shingles and
+summarised as a MinHash signature; locality-sensitive hashing (the signature
+split into bands, each band hashed to a bucket) then only compares records
+that share a bucket, so the run is roughly linear in the number of records
+instead of comparing every pair. Candidates whose estimated Jaccard
+similarity reaches --threshold are joined into clusters. Exact copies
+(identical signatures) are joined outright and bucketed once, and within a
+bucket a record is only compared with one member of each cluster already
+there, so a bucket full of copies costs one check per record.
+
+Each cluster names a canonical copy: the most installed one, then the one
+with a SKILL.md, then the first in the input. Clusters go to --output as
+JSONL; --dedupe-output also writes the input without the other copies.
+
+numpy, when installed, computes the signatures much faster.
+
+Usage:
+    python near_duplicates.py --input skills_registry.jsonl [--output near_duplicates.jsonl]
+    python near_duplicates.py -i crawled.jsonl --blob-store skill_md_blobs --threshold 0.9 --dedupe-output deduped.jsonl
+"""
+
+import argparse
+import random
+import re
+import time
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from blob_store import BlobStore, has_content, load_content
+from jsonl_io import JsonlWriter, read_records
+from metrics import METRICS, add_metrics_arguments, write_reports
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_SHINGLE_SIZE = 5  # Words per shingle
+DEFAULT_MIN_SHINGLES = 10  # Shorter texts (e.g. "Agent skill from owner/repo") are skipped
+MERSENNE_PRIME = (1 << 31) - 1  # Keeps a * hash + b within 64 bits
+FALSE_POSITIVE_WEIGHT = 0.2  # Versus 0.8 for false negatives when picking bands
+SEED = 1  # Fixed, so signatures and clusters are the same on every run
+PROGRESS_EVERY = 5000
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> set[int]:
+    """Hashed word n-grams of a text (lowercased)"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def integrate(func, start: float, end: float, steps: int = 100) -> float:
+    width = (end - start) / steps
+    return sum(func(start + (i + 0.5) * width) for i in range(steps)) * width
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    (bands, rows) for LSH, with bands * rows <= num_perm.
+
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands. The split minimises the weighted area of missed
+    pairs above threshold and extra candidates below it; misses weigh more,
+    since every candidate is verified against the full signature anyway.
+    """
+    def cost(option: tuple[int, int]) -> float:
+        bands, rows = option
+        candidate = lambda s: 1 - (1 - s ** rows) ** bands
+        false_positive = integrate(candidate, 0.0, threshold)
+        false_negative = integrate(lambda s: 1 - candidate(s), threshold, 1.0)
+        return FALSE_POSITIVE_WEIGHT * false_positive + (1 - FALSE_POSITIVE_WEIGHT) * false_negative
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)]
+    return min(options, key=cost)
+
+
+class MinHasher:
+    """MinHash signatures under num_perm hash functions (a * h + b) mod p"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM):
+        rng = random.Random(SEED)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self.params], dtype=np.uint64)
+            self._b = np.array([b for _, b in self.params], dtype=np.uint64)
+
+    def signature(self, hashes: Iterable[int]) -> array:
+        hashes = list(hashes)
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)
+            mins = ((np.outer(values, self._a) + self._b) % MERSENNE_PRIME).min(axis=0)
+            return array("I", mins.astype(np.uint32).tobytes())
+        return array("I", [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.params])
+
+
+def similarity(sig1: array, sig2: array) -> float:
+    """Estimated Jaccard similarity: the share of positions where the signatures agree"""
+    return sum(x == y for x, y in zip(sig1, sig2)) / len(sig1)
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:  # Path compression
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, x: int, y: int) -> None:
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)  # Lowest index (first in input) is the root
+
+
+def record_text(record: dict, store: Optional[BlobStore]) -> str:
+    return f"{record.get('description') or ''}\n{load_content(record, store)}"
+
+
+def summary(record: dict, index: int) -> dict:
+    """The fields a cluster member is listed with"""
+    return {
+        "index": index,
+        "id": record.get("id"),
+        "owner": record.get("owner", ""),
+        "repo": record.get("repo", ""),
+        "skill_slug": record.get("skill_slug", ""),
+        "installs": record.get("skillssh_installs", 0) or 0,
+        "has_skill_md": has_content(record),
+    }
+
+
+def find_clusters(records: Iterable[dict], threshold: float = DEFAULT_THRESHOLD,
+                  num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                  min_shingles: int = DEFAULT_MIN_SHINGLES, store: Optional[BlobStore] = None) -> list[dict]:
+    """
+    Near-duplicate clusters in records, largest first.
+
+    Only signatures and a short summary per record are kept in memory.
+    Each cluster is {"canonical": member, "members": [member, ...]}, with
+    every member's estimated similarity to the canonical copy.
+    """
+    hasher = MinHasher(num_perm)
+    bands, rows = choose_bands(num_perm, threshold)
+    buckets: list[dict[bytes, list[int]]] = [defaultdict(list) for _ in range(bands)]
+    signatures: dict[int, array] = {}
+    summaries: dict[int, dict] = {}
+    clusters = UnionFind()
+    first_with: dict[bytes, int] = {}  # Signature -> first record that had it
+
+    start = time.perf_counter()
+    for index, record in enumerate(records):
+        hashes = shingles(record_text(record, store), shingle_size)
+        if len(hashes) < min_shingles:
+            METRICS.inc("records_too_short")
+            continue
+        signature = hasher.signature(hashes)
+        signatures[index] = signature
+        summaries[index] = summary(record, index)
+        METRICS.inc("records_hashed")
+        same = first_with.setdefault(signature.tobytes(), index)
+        if same != index:
+            clusters.union(same, index)
+            METRICS.inc("identical_signatures")
+        else:
+            for band in range(bands):
+                buckets[band][signature[band * rows:(band + 1) * rows].tobytes()].append(index)
+        if (index + 1) % PROGRESS_EVERY == 0:
+            print(f"  {index + 1} records, {(index + 1) / (time.perf_counter() - start):.0f} records/s")
+
+    for band_buckets in buckets:
+        for members in band_buckets.values():
+            representatives = []  # A member of each cluster that no earlier member joined
+            for x in members:
+                joined = False
+                for y in representatives:
+                    if clusters.find(x) == clusters.find(y):
+                        joined = True
+                        continue
+                    METRICS.inc("candidate_pairs")
+                    if similarity(signatures[x], signatures[y]) >= threshold:
+                        clusters.union(x, y)
+                        joined = True
+                if not joined:
+                    representatives.append(x)
+
+    groups = defaultdict(list)
+    for index in signatures:
+        groups[clusters.find(index)].append(index)
+
+    result = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        canonical = min(members, key=lambda i: (-summaries[i]["installs"], not summaries[i]["has_skill_md"], i))
+        listed = []
+        for index in members:
+            member = dict(summaries[index])
+            member["similarity"] = round(similarity(signatures[canonical], signatures[index]), 3)
+            listed.append(member)
+        result.append({"canonical": summaries[canonical], "size": len(members), "members": listed})
+    result.sort(key=lambda cluster: (-cluster["size"], cluster["canonical"]["index"]))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate skills (forks, re-published copies)")
+    parser.add_argument("--input", "-i", required=True,
+                       help="Skills file (.json, .jsonl or .jsonl.gz)")
+    parser.add_argument("--output", "-o", default="near_duplicates.jsonl",
+                       help="Cluster groups, one JSON object per line")
+    parser.add_argument("--threshold", "-t", type=float, default=DEFAULT_THRESHOLD,
+                       help="Estimated Jaccard similarity at which two skills count as duplicates")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM,
+                       help="MinHash signature length")
+    parser.add_argument("--shingle-size", type=int, default=DEFAULT_SHINGLE_SIZE,
+                       help="Words per shingle")
+    parser.add_argument("--min-shingles", type=int, default=DEFAULT_MIN_SHINGLES,
+                       help="Skip records with fewer shingles than this")
+    parser.add_argument("--blob-store", default=None,
+                       help="Blob store directory for records that carry skill_md_sha256 references")
+    parser.add_argument("--dedupe-output", default=None,
+                       help="Also write the input without the non-canonical copies here")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    store = BlobStore(args.blob_store) if args.blob_store else None
+    bands, rows = choose_bands(args.num_perm, args.threshold)
+
+    print("=" * 60)
+    print("Near-Duplicate Skill Detection")
+    print("=" * 60)
+    print(f"  {args.input}: {args.num_perm} permutations, {bands} bands x {rows} rows, "
+          f"threshold {args.threshold} ({'numpy' if np is not None else 'pure Python'})")
+
+    start = time.perf_counter()
+    with METRICS.phase("minhash"):
+        clusters = find_clusters(read_records(args.input), args.threshold, args.num_perm,
+                                 args.shingle_size, args.min_shingles, store)
+    with METRICS.phase("save"), JsonlWriter(args.output) as out:
+        for number, cluster in enumerate(clusters, 1):
+            out.write({"cluster": number, **cluster})
+
+    duplicates = {member["index"] for cluster in clusters for member in cluster["members"]
+                  if member["index"] != cluster["canonical"]["index"]}
+    if args.dedupe_output:
+        with METRICS.phase("dedupe"), JsonlWriter(args.dedupe_output) as out:
+            for index, record in enumerate(read_records(args.input)):
+                if index not in duplicates:
+                    out.write(record)
+        print(f"  Wrote {out.count} records without duplicates to {args.dedupe_output}")
+
+    counters = METRICS.report()["counters"]
+    print(f"\n  Hashed: {counters.get('records_hashed', 0)}, too short: {counters.get('records_too_short', 0)}")
+    print(f"  Candidate pairs checked: {counters.get('candidate_pairs', 0)}")
+    print(f"  Clusters: {len(clusters)} ({len(duplicates)} non-canonical copies) -> {args.output}")
+    print(f"  Time: {time.perf_counter() - start:.1f}s")
+
+    METRICS.inc("clusters", len(clusters))
+    METRICS.inc("duplicates", len(duplicates))
+    write_reports(args, job="near_duplicates")
+
+
+if __name__ == "__main__":
+    main()
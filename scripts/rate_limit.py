@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Per-Host Rate Limiter
+
+Token buckets keyed by host, replacing the fixed sleeps the scripts used to
+do before every request. Requests go out as fast as the host's bucket allows
+and the limiter follows what the server reports:
+
+- X-RateLimit-Remaining caps the bucket at the remaining budget until
+  X-RateLimit-Reset; when it hits 0 the host is paused until then
+- Retry-After (seconds or HTTP date) on a 403, 429 or 503 pauses the host
+  for that long (GitHub sends its secondary rate limit as a 403)
+
+http_client calls acquire() before and observe() after every request, so
+scripts get this without doing anything.
+
+Usage:
+    import rate_limit
+
+    rate_limit.configure_host("api.github.com", rate=5, burst=10)
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_RATE = 10.0  # Requests per second for hosts without an entry below
+DEFAULT_BURST = 10
+
+# (requests per second, burst size)
+HOST_RATES = {
+    "skills.sh": (5.0, 5),
+    "github.com": (10.0, 10),
+    "api.github.com": (10.0, 10),
+    "raw.githubusercontent.com": (20.0, 20),
+}
+
+RETRY_AFTER_STATUSES = (403, 429, 503)
+RESET_MARGIN = 1.0  # Seconds added after X-RateLimit-Reset before resuming
+CAP_WINDOW = 60.0  # How long a remaining-budget cap holds when the server sends no reset time
+
+
+class TokenBucket:
+    """Token bucket that can also be paused until a point in time"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.limit = float(burst)  # Ceiling from the server's remaining budget
+        self.limit_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        ceiling = min(self.burst, self.limit) if now < self.limit_until else self.burst
+        self.tokens = min(ceiling, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def cap(self, remaining: int, seconds: Optional[float] = None) -> None:
+        """
+        Never hold more tokens than the server says are left, until its
+        budget resets in the given number of seconds (CAP_WINDOW if unknown)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.limit = float(remaining)
+            self.limit_until = now + (CAP_WINDOW if seconds is None else seconds)
+            self.tokens = min(self.tokens, self.limit)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token buckets per host, tuned by rate-limit response headers"""
+
+    def __init__(self, host_rates: dict = None):
+        self.host_rates = dict(HOST_RATES if host_rates is None else host_rates)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.host_rates.get(host, (DEFAULT_RATE, DEFAULT_BURST))
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def configure_host(self, host: str, rate: float, burst: int) -> None:
+        with self._lock:
+            self.host_rates[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def acquire(self, url: str) -> float:
+        """Wait for the URL's host to allow a request. Returns seconds waited."""
+        return self.bucket(urlparse(url).hostname or "").acquire()
+
+    def observe(self, url: str, response) -> None:
+        """Adjust the host's bucket from a response's rate-limit headers"""
+        headers = response.headers
+        bucket = self.bucket(urlparse(url).hostname or "")
+
+        retry_after = parse_retry_after(headers.get("Retry-After", ""))
+        if retry_after is not None and response.status_code in RETRY_AFTER_STATUSES:
+            bucket.pause(retry_after)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.isdigit():
+            return
+        remaining = int(remaining)
+        reset = headers.get("X-RateLimit-Reset")
+        reset_in = max(0.0, int(reset) - time.time()) + RESET_MARGIN if reset and reset.isdigit() else None
+        bucket.cap(remaining, reset_in)
+        if remaining == 0 and reset_in is not None:
+            bucket.pause(reset_in)
+
+
+LIMITER = RateLimiter()
+
+
+def configure_host(host: str, rate: float, burst: int) -> None:
+    """Set the request rate and burst for one host on the shared limiter"""
+    LIMITER.configure_host(host, rate, burst)
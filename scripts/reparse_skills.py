@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Re-parse SKILL.md Content
+
+Re-derives name / description / version / license / author / tags for every
+record from its stored skill_md_content, after the parsing rules change.
+Parsing is CPU-bound, so records are sent to a process pool in chunks; the
+results come back in input order and are streamed straight to the output,
+with only a few chunks in flight at a time.
+
+Records without a SKILL.md body pass through unchanged. Bodies stored by
+reference (skill_md_sha256) are read from --blob-store inside the workers, so
+only the hashes cross the process boundary.
+
+Without --output the input is rewritten in place. A .json output keeps the
+input document's wrapper (name, version, ...) and only replaces its record
+list; a bare list stays a bare list.
+
+Usage:
+    python reparse_skills.py --input skills_sh_crawled.jsonl [--output reparsed.jsonl.gz]
+    python reparse_skills.py -i skills_registry.json -o skills_registry.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from blob_store import CONTENT_FIELD, REF_FIELD, BlobStore, load_content
+from jsonl_io import RECORD_KEYS, JsonlWriter, is_jsonl, open_text, read_records
+from metrics import METRICS, add_metrics_arguments, write_reports
+from skill_md import parse_skill_md, skill_fields
+
+
+DEFAULT_CHUNK_SIZE = 500
+IN_FLIGHT_PER_WORKER = 2  # Chunks queued per worker: enough to keep it busy, bounded memory
+PROGRESS_EVERY = 10000  # Records between progress lines
+# Only these fields are shipped to the workers; an inline skill_md_content is the bulk of it
+WORKER_FIELDS = ["name", "description", "owner", "repo", "version", "tags", CONTENT_FIELD, REF_FIELD]
+
+
+def reparse_chunk(chunk: list[dict], blob_root: str = None) -> list[dict]:
+    """Derived fields for each record in a chunk (None where there is no SKILL.md). Runs in a worker."""
+    store = BlobStore(blob_root) if blob_root else None
+    results = []
+    for record in chunk:
+        content = load_content(record, store)
+        results.append(skill_fields(parse_skill_md(content), record) if content else None)
+    return results
+
+
+def chunked(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def reparse_records(records: Iterable[dict], workers: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    blob_root: str = None) -> Iterator[dict]:
+    """
+    Yield records with their SKILL.md-derived fields refreshed, in input order.
+
+    At most workers * IN_FLIGHT_PER_WORKER chunks are pending at once, so the
+    input is consumed only as fast as results are written out.
+    """
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from merge_fields(chunk, reparse_chunk(chunk, blob_root))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            payload = [{k: record.get(k, "") for k in WORKER_FIELDS} for record in chunk]
+            pending.append((chunk, pool.submit(reparse_chunk, payload, blob_root)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                chunk, future = pending.popleft()
+                yield from merge_fields(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from merge_fields(chunk, future.result())
+
+
+def merge_fields(chunk: list[dict], derived: list) -> Iterator[dict]:
+    for record, fields in zip(chunk, derived):
+        if fields is not None:
+            if any(record.get(k) != v for k, v in fields.items()):
+                METRICS.inc("records_changed")
+            record.update(fields)
+            METRICS.inc("records_reparsed")
+        yield record
+
+
+def wrap_like(path: str, records: list[dict]):
+    """records shaped like the document at path: its wrapper object with the record list replaced, or a list"""
+    if is_jsonl(path):
+        return records
+    with open_text(path) as f:
+        document = json.load(f)
+    if isinstance(document, dict):
+        for key in RECORD_KEYS:
+            if isinstance(document.get(key), list):
+                return {**document, key: records}
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-derive skill metadata from stored SKILL.md content")
+    parser.add_argument("--input", "-i", required=True,
+                       help="Skills file (.json, .jsonl or .jsonl.gz)")
+    parser.add_argument("--output", "-o", default=None,
+                       help="Output path (default: rewrite the input; .json keeps the input's wrapper)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1,
+                       help="Worker processes (1 parses in this process)")
+    parser.add_argument("--chunk-size", "-c", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help="Records per chunk sent to a worker")
+    parser.add_argument("--blob-store", default=None,
+                       help="Blob store directory for records that carry skill_md_sha256 references")
+    add_metrics_arguments(parser)
+
+    args = parser.parse_args()
+    output = args.output or args.input
+
+    print("=" * 60)
+    print("Re-parse SKILL.md Content")
+    print("=" * 60)
+    print(f"  {args.input} -> {output} ({args.workers} workers, chunks of {args.chunk_size})")
+
+    start = time.perf_counter()
+    count = 0
+    with METRICS.phase("reparse"):
+        records = reparse_records(read_records(args.input), args.workers, args.chunk_size, args.blob_store)
+        if is_jsonl(output):
+            with JsonlWriter(output) as out:
+                for record in records:
+                    out.write(record)
+                    count += 1
+                    if count % PROGRESS_EVERY == 0:
+                        print(f"  {count} records, {count / (time.perf_counter() - start):.0f} records/s")
+        else:
+            data = list(records)
+            count = len(data)
+            document = wrap_like(args.input, data)
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+    elapsed = time.perf_counter() - start
+
+    counters = METRICS.report()["counters"]
+    print(f"\n  Records: {count}")
+    print(f"  Re-parsed: {counters.get('records_reparsed', 0)}, changed: {counters.get('records_changed', 0)}")
+    print(f"  Time: {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} records/s)")
+
+    write_reports(args, job="reparse_skills")
+
+
+if __name__ == "__main__":
+    main()
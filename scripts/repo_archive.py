@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Repository Archive Harvesting
+
+Fetches a repo's tarball once and stream-extracts every SKILL.md in a single
+pass, instead of one raw.githubusercontent.com request per skill. Worth it
+for repos that hold many skills; the crawler switches to it above a
+skills-per-repo threshold.
+
+The tarball is read as a stream (tarfile mode "r|gz"), so only SKILL.md
+members are kept in memory, never the whole archive.
+
+Usage:
+    from repo_archive import fetch_skill_mds, read_skill_mds
+
+    contents = fetch_skill_mds("expo", "skills", "main")   # {path: text}
+    contents = read_skill_mds("skills-main.tar.gz")        # local archive
+"""
+
+import tarfile
+from typing import IO, Iterator, Optional
+
+import requests
+
+import http_client
+
+
+CODELOAD_BASE = "https://codeload.github.com"
+SKILL_MD_NAME = "SKILL.md"
+MAX_SKILL_MD_BYTES = 1024 * 1024  # Skip anything larger; real SKILL.md files are a few KB
+
+
+def archive_url(owner: str, repo: str, branch: str) -> str:
+    return f"{CODELOAD_BASE}/{owner}/{repo}/tar.gz/refs/heads/{branch}"
+
+
+def iter_skill_mds(fileobj: IO[bytes]) -> Iterator[tuple[str, str]]:
+    """
+    Yield (path, content) for every SKILL.md in a gzipped tar stream.
+
+    Paths are relative to the repo root: GitHub's top-level
+    "{repo}-{branch}/" directory is stripped.
+    """
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            if not member.isfile() or member.size > MAX_SKILL_MD_BYTES:
+                continue
+            name = member.name
+            if name != SKILL_MD_NAME and not name.endswith("/" + SKILL_MD_NAME):
+                continue
+            _, _, path = name.partition("/")
+            data = archive.extractfile(member)
+            if data is None:
+                continue
+            yield path or name, data.read().decode("utf-8", errors="replace")
+
+
+def fetch_skill_mds(owner: str, repo: str, branch: str, url: str = None) -> Optional[dict[str, str]]:
+    """Download a repo tarball and collect its SKILL.md files, None on failure"""
+    try:
+        response = http_client.get(url or archive_url(owner, repo, branch), stream=True)
+        if response.status_code != 200:
+            response.close()
+            return None
+        with response:
+            response.raw.decode_content = False  # tarfile does the gunzip
+            return dict(iter_skill_mds(response.raw))
+    except (requests.RequestException, tarfile.TarError, EOFError, OSError):
+        return None
+
+
+def read_skill_mds(path: str) -> dict[str, str]:
+    """Collect SKILL.md files from a local .tar.gz (e.g. a saved archive)"""
+    with open(path, "rb") as f:
+        return dict(iter_skill_mds(f))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Repo Status Cache
+
+Persisted (owner, repo) -> existence map shared by merge_and_validate,
+update_skill_fields --validate and validate_github_skill, so a repo is
+checked once per TTL across every tool and run instead of once per chunk
+or per script.
+
+Each check stores one of three statuses with the time it was made:
+    exists     github.com/{owner}/{repo} answered 200 (after redirects, so renamed repos count)
+    404        the repo is gone or private
+    error      anything else (timeouts, 5xx after retries, 451, ...)
+
+Statuses expire on separate TTLs: a repo that exists is trusted for a week,
+a 404 is rechecked after a day (repos get published or made public), and
+an error only lives for a few minutes so a flaky run doesn't stick.
+
+Usage:
+    import repo_status
+
+    repo_status.enable("repo_status.sqlite")
+    if repo_status.repo_exists("expo", "skills"):
+        ...
+    repo_status.status("expo", "skills")      # "exists" / "404" / "error"
+    repo_status.disable()
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import requests
+
+import http_client
+from metrics import METRICS
+from ttl_cache import TTLCache
+
+
+DEFAULT_DB = "repo_status.sqlite"
+EXISTS = "exists"
+NOT_FOUND = "404"
+ERROR = "error"
+POSITIVE_TTL = 7 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+ERROR_TTL = 10 * 60
+REQUEST_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repo_status (
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    http_status INTEGER,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (owner, repo)
+)
+"""
+
+
+def check_repo(owner: str, repo: str) -> tuple[str, Optional[int]]:
+    """Ask github.com whether a repo exists: (status, HTTP status code or None)"""
+    try:
+        response = http_client.head(f"https://github.com/{owner}/{repo}",
+                                    timeout=REQUEST_TIMEOUT, allow_redirects=True)
+    except requests.RequestException:
+        return ERROR, None
+    if response.status_code == 200:
+        return EXISTS, 200
+    if response.status_code == 404:
+        return NOT_FOUND, 404
+    return ERROR, response.status_code
+
+
+class RepoStatusCache:
+    """Repo statuses in memory (LRU), optionally backed by a SQLite file"""
+
+    def __init__(self, path: str = None, positive_ttl: float = POSITIVE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL, error_ttl: float = ERROR_TTL,
+                 max_memory: int = None):
+        self.path = path
+        self.ttls = {EXISTS: positive_ttl, NOT_FOUND: negative_ttl, ERROR: error_ttl}
+        self._memory = TTLCache(maxsize=max_memory)
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(SCHEMA)
+            now = time.time()
+            for status, ttl in self.ttls.items():
+                self._db.execute("DELETE FROM repo_status WHERE status = ? AND checked_at < ?",
+                                 (status, now - ttl))
+            self._db.commit()
+
+    def ttl(self, status: str) -> float:
+        return self.ttls.get(status, self.ttls[ERROR])
+
+    def cached(self, owner: str, repo: str) -> Optional[str]:
+        """Stored status for owner/repo if still fresh, without any network call"""
+        key = (owner.lower(), repo.lower())
+        status = self._memory.get(key)
+        if status:
+            return status
+        if self._db is None:
+            return None
+        with self._guard:
+            row = self._db.execute(
+                "SELECT status, checked_at FROM repo_status WHERE owner = ? AND repo = ?", key
+            ).fetchone()
+        if row:
+            status, checked_at = row
+            remaining = checked_at + self.ttl(status) - time.time()
+            if remaining > 0:
+                self._memory.set(key, status, ttl=remaining)
+                return status
+        return None
+
+    def store(self, owner: str, repo: str, status: str, http_status: Optional[int] = None) -> None:
+        key = (owner.lower(), repo.lower())
+        self._memory.set(key, status, ttl=self.ttl(status))
+        if self._db is None:
+            return
+        with self._guard:
+            self._db.execute(
+                "INSERT OR REPLACE INTO repo_status VALUES (?, ?, ?, ?, ?)",
+                (key[0], key[1], status, http_status, time.time())
+            )
+            self._db.commit()
+
+    def get(self, owner: str, repo: str) -> str:
+        """Status for owner/repo, checking github.com at most once per TTL"""
+        status = self.cached(owner, repo)
+        if status:
+            METRICS.inc("repo_status_cached")
+            return status
+        key = (owner.lower(), repo.lower())
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            status = self.cached(owner, repo)
+            if not status:
+                status, http_status = check_repo(owner, repo)
+                METRICS.inc("repo_status_checked")
+                self.store(owner, repo, status, http_status)
+        with self._guard:
+            self._locks.pop(key, None)
+        return status
+
+    def forget(self, owner: str, repo: str) -> None:
+        """Drop a repo's status so the next lookup checks it again"""
+        key = (owner.lower(), repo.lower())
+        self._memory.pop(key)
+        if self._db is not None:
+            with self._guard:
+                self._db.execute("DELETE FROM repo_status WHERE owner = ? AND repo = ?", key)
+                self._db.commit()
+
+    def stats(self) -> dict:
+        return self._memory.stats()
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._guard:
+                self._db.close()
+            self._db = None
+
+
+_active = RepoStatusCache()
+
+
+def enable(path: str = DEFAULT_DB, max_memory: int = None, **ttls) -> RepoStatusCache:
+    """Persist repo statuses to path (otherwise they only live for this run)"""
+    global _active
+    _active.close()
+    _active = RepoStatusCache(path, max_memory=max_memory, **ttls)
+    return _active
+
+
+def active() -> RepoStatusCache:
+    """The cache status() currently uses"""
+    return _active
+
+
+def disable() -> None:
+    """Close the persisted cache and fall back to an in-memory one"""
+    global _active
+    _active.close()
+    _active = RepoStatusCache()
+
+
+def status(owner: str, repo: str) -> str:
+    """Status of owner/repo: EXISTS, NOT_FOUND or ERROR"""
+    return _active.get(owner, repo)
+
+
+def repo_exists(owner: str, repo: str) -> bool:
+    if not owner or not repo:
+        return False
+    return status(owner, repo) == EXISTS
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Repository Tree Index
+
+Fetches the recursive git tree of a repo once (the default branch comes from
+branch_cache, then one API call for the tree) and records every SKILL.md path in it. Looking up
+a skill's SKILL.md is then a dictionary lookup instead of a round of HEAD
+probes over path patterns and branches.
+
+API calls are authenticated with GITHUB_TOKEN when it is set (5000 instead
+of 60 requests an hour). Once GitHub reports the budget spent, no tree is
+fetched until X-RateLimit-Reset: get() returns None without caching it, so
+callers fall back to their raw URL probes and the repo is listed again later.
+
+Usage:
+    from repo_tree import RepoTreeIndex
+
+    index = RepoTreeIndex()
+    url = index.find_skill_md_url("expo", "skills", "upgrading-expo")
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import requests
+
+import branch_cache
+import http_cache
+from ttl_cache import MISSING, TTLCache
+
+
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
+SKILL_MD_NAME = "SKILL.md"
+DEFAULT_EXHAUSTED_WAIT = 60.0  # Seconds to skip the API when a rate-limit response has no reset time
+
+_api_exhausted_until = 0.0  # Wall-clock time the API budget resets, once it is spent
+
+
+@dataclass
+class RepoTree:
+    """SKILL.md layout of one repo at its default branch"""
+    owner: str
+    repo: str
+    branch: str
+    skill_md_paths: list[str] = field(default_factory=list)
+    truncated: bool = False  # GitHub cut the listing short; the index may be incomplete
+    by_slug: dict[str, list[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.by_slug:
+            for path in self.skill_md_paths:
+                parts = path.split("/")
+                slug = parts[-2] if len(parts) > 1 else ""
+                self.by_slug.setdefault(slug, []).append(path)
+
+    def raw_url(self, path: str) -> str:
+        return f"{GITHUB_RAW_BASE}/{self.owner}/{self.repo}/{self.branch}/{path}"
+
+    def find_skill_md_path(self, skill_slug: str) -> Optional[str]:
+        """
+        Path of the SKILL.md for a skill directory, or None.
+
+        Preference follows the old probe order: skills/{slug}, {slug},
+        plugins/*/skills/{slug}, then any other {slug}/SKILL.md.
+        """
+        candidates = self.by_slug.get(skill_slug, [])
+        if not candidates:
+            return None
+
+        def rank(path: str) -> tuple[int, str]:
+            parts = path.split("/")
+            if parts[:-2] == ["skills"]:
+                return 0, path
+            if len(parts) == 2:
+                return 1, path
+            if len(parts) == 5 and parts[0] == "plugins" and parts[2] == "skills":
+                return 2, path
+            return 3, path
+
+        return min(candidates, key=rank)
+
+
+def api_headers() -> dict:
+    """GitHub API request headers, with GITHUB_TOKEN as the bearer token when set"""
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def api_exhausted() -> bool:
+    """Whether GitHub said the API budget is spent and it has not reset yet"""
+    return time.time() < _api_exhausted_until
+
+
+def note_rate_limit(response: requests.Response) -> None:
+    """Remember when the API budget resets if a response says it is spent"""
+    global _api_exhausted_until
+    if response.status_code not in (403, 429) or response.headers.get("X-RateLimit-Remaining") != "0":
+        return
+    reset = response.headers.get("X-RateLimit-Reset", "")
+    _api_exhausted_until = int(reset) if reset.isdigit() else time.time() + DEFAULT_EXHAUSTED_WAIT
+
+
+def fetch_json(url: str) -> Optional[dict]:
+    """GET a GitHub API URL through the HTTP cache, None on any failure"""
+    try:
+        response = http_cache.get(url, headers=api_headers())
+        if response.status_code != 200:
+            note_rate_limit(response)
+            return None
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def fetch_repo_tree(owner: str, repo: str, branch: str = None) -> Optional[RepoTree]:
+    """Fetch the recursive tree of a repo and collect its SKILL.md paths"""
+    if api_exhausted():
+        return None
+    branch = branch or branch_cache.default_branch(owner, repo)
+    if not branch:
+        return None
+    data = fetch_json(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
+    if not data or "tree" not in data:
+        return None
+    paths = [
+        item["path"] for item in data["tree"]
+        if item.get("type") == "blob"
+        and (item.get("path") == SKILL_MD_NAME or item.get("path", "").endswith("/" + SKILL_MD_NAME))
+    ]
+    return RepoTree(owner=owner, repo=repo, branch=branch,
+                    skill_md_paths=sorted(paths), truncated=bool(data.get("truncated")))
+
+
+class RepoTreeIndex:
+    """
+    In-process index of repo trees, fetched at most once per owner/repo.
+
+    Unbounded by default; long-running processes can cap it with max_repos
+    (least recently used dropped first) and ttl (seconds before a refetch).
+    """
+
+    def __init__(self, max_repos: int = None, ttl: float = None):
+        self._trees = TTLCache(maxsize=max_repos, ttl=ttl)
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(self, owner: str, repo: str) -> Optional[RepoTree]:
+        """Tree for owner/repo (None if it could not be listed), fetching on first use"""
+        key = (owner.lower(), repo.lower())
+        tree = self._trees.get(key, MISSING)
+        if tree is not MISSING:
+            return tree
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            tree = self._trees.get(key, MISSING)
+            if tree is MISSING:
+                tree = fetch_repo_tree(owner, repo)
+                if tree is not None or not api_exhausted():  # Unlisted for lack of budget: retry later
+                    self._trees.set(key, tree)
+        with self._guard:
+            self._locks.pop(key, None)
+        return tree
+
+    def find_skill_md_url(self, owner: str, repo: str, skill_slug: str) -> Optional[str]:
+        """Raw SKILL.md URL for a skill, or None if the tree has no match"""
+        tree = self.get(owner, repo)
+        if not tree:
+            return None
+        path = tree.find_skill_md_path(skill_slug)
+        return tree.raw_url(path) if path else None
+
+    def forget(self, owner: str, repo: str) -> None:
+        """Drop a repo's tree once its skills are done"""
+        self._trees.pop((owner.lower(), repo.lower()), None)
+
+    def stats(self) -> dict:
+        return self._trees.stats()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+SKILL.md Frontmatter Parsing
+
+The one SKILL.md parser shared by the crawler and the validators.
+
+- Simple frontmatter (flat "key: plain text" lines, which is most SKILL.md
+  files) is read with a line splitter instead of a YAML parser
+- Anything else goes through yaml's C loader (CSafeLoader) when libyaml is
+  available, the pure-Python SafeLoader otherwise
+- Results are memoized by the SHA-256 of the file, so identical SKILL.md
+  files (forks, vendored copies) are parsed once per run
+
+Usage:
+    from skill_md import parse_skill_md
+
+    parsed = parse_skill_md(content)
+    print(parsed.name, parsed.description, parsed.version)
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import yaml
+
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+DEFAULT_VERSION = "1.0.0"
+MEMO_SIZE = 4096  # Parsed results kept, least recently used dropped first
+
+SIMPLE_LINE = re.compile(r"^([A-Za-z_][\w-]*): +(.*?) *$")
+# First characters that make a YAML scalar something other than plain text
+# (sequences, flow collections, quotes, anchors, tags, block scalars, ...)
+NON_PLAIN_START = set("-?:,[]{}#&*!|>'\"%@`")
+STR_TAG = "tag:yaml.org,2002:str"
+# YAML's own implicit typing, to tell "1.0.0" (a string) from "1.0" (a float)
+_resolver = yaml.resolver.Resolver()
+
+
+def is_plain_string(scalar: str) -> bool:
+    """Whether YAML would read an unquoted scalar as this exact string"""
+    return _resolver.resolve(yaml.ScalarNode, scalar, (True, False)) == STR_TAG
+
+
+@dataclass(frozen=True)
+class SkillMd:
+    """Metadata from a SKILL.md frontmatter block"""
+    name: str = ""
+    description: str = ""
+    version: str = DEFAULT_VERSION
+    license: str = ""
+    author: str = ""
+    keywords: tuple[str, ...] = ()
+    has_frontmatter: bool = False
+
+
+def split_frontmatter(content: str) -> Optional[str]:
+    """The frontmatter text of a SKILL.md, or None if it has none"""
+    if not content.startswith("---"):
+        return None
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return None
+    return parts[1]
+
+
+def parse_simple_frontmatter(text: str) -> Optional[dict]:
+    """
+    Read flat "key: value" frontmatter without YAML.
+
+    Returns None as soon as a line needs a real YAML parser (nesting, lists,
+    quoting, block scalars, comments, or values YAML would not read as a
+    string), so the result always matches what YAML would produce.
+    """
+    data = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = SIMPLE_LINE.match(line)
+        if not match:
+            return None
+        key, value = match.groups()
+        if (not value or value[0] in NON_PLAIN_START or ": " in value or " #" in value
+                or "\t" in value or value.endswith(":")
+                or not is_plain_string(value) or not is_plain_string(key)):
+            return None
+        data[key] = value
+    return data
+
+
+def load_frontmatter(text: str) -> Optional[dict]:
+    """Frontmatter as a dict (None if it is not a mapping or not valid YAML)"""
+    data = parse_simple_frontmatter(text)
+    if data is not None:
+        return data
+    try:
+        data = yaml.load(text, Loader=YAML_LOADER)
+    except yaml.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _keywords(value) -> tuple[str, ...]:
+    if isinstance(value, (list, tuple)):
+        return tuple(str(k) for k in value if k is not None)
+    if value:
+        return (str(value),)
+    return ()
+
+
+def build_result(frontmatter: dict) -> SkillMd:
+    """Normalize a frontmatter mapping into a SkillMd"""
+    author = frontmatter.get("author")
+    if isinstance(author, dict):
+        author = author.get("name", "")
+    version = frontmatter.get("version")
+
+    # Some skills keep author/version under a metadata: block
+    metadata = frontmatter.get("metadata")
+    if isinstance(metadata, dict):
+        author = author or metadata.get("author")
+        version = version or metadata.get("version")
+
+    return SkillMd(
+        name=_text(frontmatter.get("name")),
+        description=_text(frontmatter.get("description")),
+        version=_text(version) or DEFAULT_VERSION,
+        license=_text(frontmatter.get("license")),
+        author=_text(author),
+        keywords=_keywords(frontmatter.get("keywords")),
+        has_frontmatter=True,
+    )
+
+
+def parse_uncached(content: str) -> SkillMd:
+    """Parse a SKILL.md without touching the memo"""
+    text = split_frontmatter(content)
+    if text is None:
+        return SkillMd()
+    frontmatter = load_frontmatter(text)
+    if frontmatter is None:
+        return SkillMd()
+    return build_result(frontmatter)
+
+
+def skill_fields(parsed: SkillMd, record: dict) -> dict:
+    """
+    Registry fields a SKILL.md determines for a skill record.
+
+    Only fields the SKILL.md sets are returned, so the record keeps its own
+    values for the rest; its description only replaces a missing one or the
+    "Agent skill from owner/repo" placeholder. Tags keep the record's type: a
+    list stays a list, anything else gets the crawler's JSON string.
+    """
+    owner, repo = record.get("owner", ""), record.get("repo", "")
+    description = record.get("description", "")
+    fields = {}
+    if parsed.name:
+        fields["name"] = parsed.name
+    if parsed.description and (not description or description == f"Agent skill from {owner}/{repo}"):
+        fields["description"] = parsed.description[:500]
+    # A missing version parses as DEFAULT_VERSION; that only fills a record without one
+    if parsed.version != DEFAULT_VERSION or not record.get("version"):
+        fields["version"] = parsed.version
+    if parsed.license:
+        fields["license"] = parsed.license
+    if parsed.author:
+        fields["author"] = parsed.author
+    if parsed.keywords:
+        keywords = list(parsed.keywords)
+        fields["tags"] = keywords if isinstance(record.get("tags"), list) else json.dumps(keywords)
+    return fields
+
+
+_memo: "OrderedDict[str, SkillMd]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def parse_skill_md(content: str) -> SkillMd:
+    """Parse a SKILL.md, reusing the result for content seen before"""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    with _memo_lock:
+        cached = _memo.get(digest)
+        if cached is not None:
+            _memo.move_to_end(digest)
+            return cached
+    result = parse_uncached(content)
+    with _memo_lock:
+        _memo[digest] = result
+        if len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
+
+
+def clear_memo() -> None:
+    with _memo_lock:
+        _memo.clear()
+
+
+def memo_stats() -> dict:
+    return {"entries": len(_memo), "maxsize": MEMO_SIZE}
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+LRU + TTL Cache
+
+Small thread-safe in-memory cache for long-running processes (the validation
+daemon, big crawls): entries are dropped least recently used first once
+maxsize is reached, and expire ttl seconds after they were stored. Either
+limit can be None to turn it off.
+
+Usage:
+    from ttl_cache import TTLCache
+
+    cache = TTLCache(maxsize=10000, ttl=3600)
+    cache.set(("expo", "skills"), True)
+    exists = cache.get(("expo", "skills"))     # None once expired or evicted
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+MISSING = object()  # get() default that tells a stored None apart from a miss
+
+
+class TTLCache:
+    """Least-recently-used mapping whose entries also expire after ttl seconds"""
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[Optional[float], object]]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None) -> None:
+        """Store a value; ttl overrides the cache's for this entry (e.g. shorter for negative results)"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
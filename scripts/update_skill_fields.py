@@ -14,6 +14,8 @@ This script:
 
 Usage:
     python update_skill_fields.py [--validate] [--input marketplace.json]
+
+Files ending in .jsonl / .jsonl.gz are updated as a stream, one skill at a time.
 """
 
 import json
@@ -21,8 +23,12 @@ import re
 import argparse
 from pathlib import Path
 from typing import Optional
-import requests
-import time
+
+import branch_cache
+import http_client
+import repo_status
+from jsonl_io import JsonlWriter, is_jsonl, read_records
+from metrics import METRICS, add_metrics_arguments, write_reports
 
 
 def parse_github_url(url: str) -> dict:
@@ -96,12 +102,18 @@ def clean_github_url(url: str) -> str:
     return base
 
 
-def guess_skill_md_url(owner: str, repo: str, skill_slug: str, source_path: str = "") -> list[str]:
+def guess_skill_md_url(owner: str, repo: str, skill_slug: str, source_path: str = "",
+                       resolve_branch: bool = False) -> list[str]:
     """
     Generate possible raw GitHub URLs where SKILL.md might be located.
     Returns a list of URLs to try.
+    
+    URLs use the repo's default branch when it is known (from the branch
+    cache, or looked up when resolve_branch is set); otherwise main, plus a
+    master fallback.
     """
-    base = f"https://raw.githubusercontent.com/{owner}/{repo}/main"
+    branch = branch_cache.default_branch(owner, repo, fetch=resolve_branch)
+    base = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch or 'main'}"
     
     urls = []
     
@@ -120,9 +132,9 @@ def guess_skill_md_url(owner: str, repo: str, skill_slug: str, source_path: str
             f"{base}/plugins/{skill_slug}/skills/{skill_slug}/SKILL.md",
         ])
     
-    # Also try master branch
-    master_base = f"https://raw.githubusercontent.com/{owner}/{repo}/master"
-    if skill_slug:
+    # Branch unknown: also try master
+    if skill_slug and not branch:
+        master_base = f"https://raw.githubusercontent.com/{owner}/{repo}/master"
         urls.append(f"{master_base}/skills/{skill_slug}/SKILL.md")
     
     return list(dict.fromkeys(urls))  # Remove duplicates while preserving order
@@ -131,7 +143,7 @@ def guess_skill_md_url(owner: str, repo: str, skill_slug: str, source_path: str
 def validate_skill_md_url(url: str) -> bool:
     """Check if a SKILL.md URL exists."""
     try:
-        response = requests.head(url, timeout=5)
+        response = http_client.head(url)
         return response.status_code == 200
     except:
         return False
@@ -139,12 +151,11 @@ def validate_skill_md_url(url: str) -> bool:
 
 def find_valid_skill_md_url(owner: str, repo: str, skill_slug: str, source_path: str = "") -> Optional[str]:
     """Find a valid SKILL.md URL by trying multiple patterns."""
-    urls = guess_skill_md_url(owner, repo, skill_slug, source_path)
+    urls = guess_skill_md_url(owner, repo, skill_slug, source_path, resolve_branch=True)
     
     for url in urls:
         if validate_skill_md_url(url):
             return url
-        time.sleep(0.1)  # Rate limiting
     
     return None
 
@@ -175,8 +186,10 @@ def update_skill(skill: dict, validate: bool = False) -> dict:
         )
         skill["skill_md_url"] = possible_urls[0] if possible_urls else ""
         
-        # Validate if requested
-        if validate:
+        # Validate if requested (no URL probes for repos known to be gone; an ERROR still probes)
+        if validate and repo_status.status(parsed["owner"], parsed["repo"]) == repo_status.NOT_FOUND:
+            skill["skill_md_validated"] = False
+        elif validate:
             valid_url = find_valid_skill_md_url(
                 parsed["owner"],
                 parsed["repo"],
@@ -194,8 +207,25 @@ def update_skill(skill: dict, validate: bool = False) -> dict:
     return skill
 
 
+def update_jsonl(input_path: str, output_path: str = None, validate: bool = False) -> None:
+    """Update a JSONL skills file one record at a time."""
+    output = output_path or input_path
+    print(f"Streaming {input_path}...")
+    
+    with JsonlWriter(output) as out:
+        for i, skill in enumerate(read_records(input_path), 1):
+            if i % 100 == 0:
+                print(f"  Processing {i}...")
+            out.write(update_skill(skill, validate))
+    
+    print(f"\nUpdated {out.count} entries in {output}")
+
+
 def update_marketplace_json(input_path: str, output_path: str = None, validate: bool = False) -> None:
     """Update marketplace.json with new fields."""
+    if is_jsonl(input_path):
+        return update_jsonl(input_path, output_path, validate)
+    
     print(f"Loading {input_path}...")
     
     with open(input_path, 'r', encoding='utf-8') as f:
@@ -223,6 +253,9 @@ def update_marketplace_json(input_path: str, output_path: str = None, validate:
 
 def update_claude_plugins_json(input_path: str, output_path: str = None, validate: bool = False) -> None:
     """Update claude-plugins.json with new fields."""
+    if is_jsonl(input_path):
+        return update_jsonl(input_path, output_path, validate)
+    
     print(f"Loading {input_path}...")
     
     with open(input_path, 'r', encoding='utf-8') as f:
@@ -259,20 +292,32 @@ def main():
                        help="Validate SKILL.md URLs exist")
     parser.add_argument("--only", choices=["marketplace", "plugins"],
                        help="Only update one file")
+    parser.add_argument("--branch-cache", default=branch_cache.DEFAULT_DB,
+                       help="SQLite file for resolved default branches")
+    parser.add_argument("--repo-cache", default=repo_status.DEFAULT_DB,
+                       help="SQLite file for repo existence checks, shared with the other tools")
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
+    branch_cache.enable(args.branch_cache)
+    if args.validate:
+        repo_status.enable(args.repo_cache)
     
     if args.only != "plugins":
         if Path(args.marketplace).exists():
-            update_marketplace_json(args.marketplace, validate=args.validate)
+            with METRICS.phase("marketplace"):
+                update_marketplace_json(args.marketplace, validate=args.validate)
         else:
             print(f"Warning: {args.marketplace} not found")
     
     if args.only != "marketplace":
         if Path(args.plugins).exists():
-            update_claude_plugins_json(args.plugins, validate=args.validate)
+            with METRICS.phase("plugins"):
+                update_claude_plugins_json(args.plugins, validate=args.validate)
         else:
             print(f"Warning: {args.plugins} not found")
+    
+    write_reports(args, job="update_skill_fields")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Skill Validation Daemon
+
+Long-running local service around validate_github_skill.validate_skill, so
+submission checks skip Python startup and hit warm caches: repo existence,
+default branches, repo trees, parsed SKILL.md frontmatter and whole results,
+each bounded (LRU) and expiring (TTL). A repo it has already seen validates
+in milliseconds.
+
+Serves HTTP on a TCP port or, with --socket, on a Unix domain socket.
+
+Endpoints:
+    GET  /validate?repo=owner/repo[&all=1]   validation result (all=1 adds every SKILL.md path)
+    POST /validate      {"repo": "...", "all": false}
+    POST /invalidate    {"repo": "..."}      forget everything cached for a repo
+    GET  /stats         cache sizes and hit ratios, plus request metrics
+    GET  /health
+
+Usage:
+    python validate_daemon.py [--port 8765]
+    python validate_daemon.py --socket /tmp/skill-validate.sock
+    curl 'http://127.0.0.1:8765/validate?repo=expo/skills'
+    python validate_github_skill.py expo/skills --daemon unix:/tmp/skill-validate.sock
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import branch_cache
+import repo_status
+import skill_md
+import validate_github_skill as validator
+from metrics import METRICS
+from repo_tree import RepoTreeIndex
+from ttl_cache import TTLCache
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_REPOS = 10000  # Entries kept per cache
+RESULT_TTL = 600  # Seconds a validation result is reused
+NEGATIVE_RESULT_TTL = 60  # Invalid results are rechecked sooner (the repo may just have been fixed)
+TREE_TTL = 3600
+
+RESULTS = TTLCache(maxsize=MAX_REPOS, ttl=RESULT_TTL)
+
+
+def configure_caches(max_repos: int, result_ttl: float, tree_ttl: float,
+                     branch_db: str, repo_db: str) -> None:
+    """Replace the validator's process-wide caches with bounded, expiring ones"""
+    global RESULTS
+    RESULTS = TTLCache(maxsize=max_repos, ttl=result_ttl)
+    validator.TREE_INDEX = RepoTreeIndex(max_repos=max_repos, ttl=tree_ttl)
+    branch_cache.enable(branch_db, max_memory=max_repos)
+    repo_status.enable(repo_db, max_memory=max_repos)
+
+
+def repo_key(spec: str) -> tuple[str, str]:
+    owner, repo = validator.parse_input(spec)
+    return owner.lower(), repo.lower()
+
+
+def validate(spec: str, find_all: bool = False) -> dict:
+    """Validation result for a repo spec, from cache when fresh"""
+    start = time.perf_counter()
+    key = repo_key(spec)
+    result = RESULTS.get(key)
+    cached = result is not None
+    if not cached:
+        METRICS.inc("validations")
+        result = validator.validate_skill(spec)
+        if all(key):
+            RESULTS.set(key, result, ttl=None if result.valid else NEGATIVE_RESULT_TTL)
+    else:
+        METRICS.inc("validations_cached")
+    response = {"result": result.to_dict(), "cached": cached}
+    if find_all and result.valid:
+        response["skill_files"] = [path for path, _ in validator.find_skill_md(result.owner, result.repo)]
+    response["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return response
+
+
+def invalidate(spec: str) -> None:
+    """Drop every cached fact about a repo"""
+    owner, repo = repo_key(spec)
+    RESULTS.pop((owner, repo))
+    repo_status.active().forget(owner, repo)
+    validator.TREE_INDEX.forget(owner, repo)
+    branch_cache.active().forget(owner, repo)
+
+
+def cache_stats() -> dict:
+    return {
+        "results": RESULTS.stats(),
+        "repo_status": repo_status.active().stats(),
+        "trees": validator.TREE_INDEX.stats(),
+        "default_branches": branch_cache.active().stats(),
+        "parsed_skill_md": skill_md.memo_stats(),
+    }
+
+
+class ValidationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    quiet = False
+
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_validation(self, spec: str, find_all: bool) -> None:
+        try:
+            payload = validate(spec, find_all)
+        except Exception as e:  # Keep serving; the caller gets the error instead of a dropped connection
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self.send_json(200, payload)
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError(f"negative Content-Length {length}")
+        if not length:
+            return {}
+        data = json.loads(self.rfile.read(length))
+        return data if isinstance(data, dict) else {}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif url.path == "/stats":
+            self.send_json(200, {"caches": cache_stats(), "metrics": METRICS.report()})
+        elif url.path == "/validate":
+            query = parse_qs(url.query)
+            spec = (query.get("repo") or [""])[0]
+            if not spec:
+                self.send_json(400, {"error": "missing repo parameter"})
+                return
+            find_all = (query.get("all") or ["0"])[0] in ("1", "true", "yes")
+            self.send_validation(spec, find_all)
+        else:
+            self.send_json(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            data = self.read_json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.send_json(400, {"error": "body must be a JSON object"})
+            return
+        except ValueError:
+            self.close_connection = True  # The body's extent is unknown, so the stream can't be reused
+            self.send_json(400, {"error": "invalid Content-Length"})
+            return
+        spec = str(data.get("repo") or "")
+        if url.path not in ("/validate", "/invalidate"):
+            self.send_json(404, {"error": f"unknown path {url.path}"})
+        elif not spec:
+            self.send_json(400, {"error": "missing repo"})
+        elif url.path == "/validate":
+            self.send_validation(spec, bool(data.get("all")))
+        else:
+            invalidate(spec)
+            self.send_json(200, {"invalidated": spec})
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # Stale socket from an earlier run
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve skill repo validation with warm caches")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                       help="Address to listen on")
+    parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT,
+                       help="TCP port to listen on")
+    parser.add_argument("--socket", "-s", default=None,
+                       help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-repos", type=int, default=MAX_REPOS,
+                       help="Repos kept in each cache (least recently used dropped first)")
+    parser.add_argument("--result-ttl", type=float, default=RESULT_TTL,
+                       help="Seconds a validation result is reused")
+    parser.add_argument("--tree-ttl", type=float, default=TREE_TTL,
+                       help="Seconds a repo tree is reused")
+    parser.add_argument("--branch-cache", default=branch_cache.DEFAULT_DB,
+                       help="SQLite file for resolved default branches")
+    parser.add_argument("--repo-cache", default=repo_status.DEFAULT_DB,
+                       help="SQLite file for repo existence checks, shared with the other tools")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                       help="Don't log each request")
+    args = parser.parse_args()
+
+    configure_caches(args.max_repos, args.result_ttl, args.tree_ttl, args.branch_cache, args.repo_cache)
+    ValidationHandler.quiet = args.quiet
+
+    if args.socket:
+        server = UnixHTTPServer(args.socket, ValidationHandler)
+        where = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), ValidationHandler)
+        where = f"http://{args.host}:{server.server_port}"
+    print(f"Skill validation daemon listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        branch_cache.disable()
+        repo_status.disable()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,57 @@ GitHub Skill Validator
 
 This utility validates GitHub skill repositories:
 1. Checks if the repo exists
-2. Searches for SKILL.md in common locations
+2. Lists every SKILL.md in the repo from one recursive git tree
 3. Parses and validates SKILL.md frontmatter
 4. Returns the valid SKILL.md URL and extracted metadata
 
 Usage:
     python validate_github_skill.py owner/repo
     python validate_github_skill.py https://github.com/owner/repo
+    python validate_github_skill.py --batch repos.txt --workers 16 > results.jsonl
+    cat repos.txt | python validate_github_skill.py --batch -
+    python validate_github_skill.py owner/repo --daemon http://127.0.0.1:8765
+    python validate_github_skill.py --batch repos.txt --daemon unix:/tmp/skill-validate.sock
+
+Batch mode validates many repos concurrently (one per line, # comments
+allowed) and streams one JSON result per line in completion order, with a
+throughput summary on stderr.
+
+With --daemon, repos are validated by a running validate_daemon.py (HTTP URL
+or unix:/path/to/socket) and its warm caches; a repo the daemon can't answer
+for is validated locally instead.
 """
 
 import re
+import sys
 import json
+import time
+import socket
 import argparse
-import requests
-import yaml
-from typing import Optional
-from dataclasses import dataclass
+import http.client
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
+from dataclasses import dataclass, fields
+from urllib.parse import urlencode, urlparse
+
+import branch_cache
+import repo_status
+import http_client
+from jsonl_io import JsonlWriter, dumps
+from metrics import METRICS, add_metrics_arguments, write_reports
+from repo_tree import RepoTreeIndex
+from skill_md import parse_skill_md
 
 
-GITHUB_API = "https://api.github.com"
 GITHUB_RAW = "https://raw.githubusercontent.com"
+# Probed directly only when the repo tree can't be listed
+ROOT_PATTERNS = ["SKILL.md", "skill.md", "skills/SKILL.md"]
+DEFAULT_BATCH_WORKERS = 16
+DAEMON_TIMEOUT = 30  # Seconds to wait for the daemon (a cold repo takes a few requests)
+IN_FLIGHT_PER_WORKER = 4  # Specs queued per worker, so a huge batch file is read as it is validated
 
+# Recursive git trees, so validate_skill and --all share one listing per repo
+TREE_INDEX = RepoTreeIndex()
 
 @dataclass
 class SkillValidationResult:
@@ -77,149 +107,39 @@ def parse_input(input_str: str) -> tuple[str, str]:
 
 def check_repo_exists(owner: str, repo: str) -> bool:
     """Check if a GitHub repo exists using HTML page (avoids API rate limits)"""
-    try:
-        response = requests.head(f"https://github.com/{owner}/{repo}", timeout=10)
-        return response.status_code == 200
-    except:
-        return False
+    return repo_status.repo_exists(owner, repo)
 
 
 def find_skill_md(owner: str, repo: str) -> list[tuple[str, str]]:
     """
     Search for SKILL.md files in a repository.
-    Returns list of (path, raw_url) tuples.
-    Uses raw URL checks to avoid API rate limits.
-    """
-    found = []
+    Returns list of (path, raw_url) tuples, shallowest paths first.
     
-    # Common pattern locations to try directly
-    patterns_to_try = [
-        "SKILL.md",
-        "skill.md",
-        "skills/SKILL.md",
-    ]
+    Every SKILL.md comes from one recursive tree listing of the default
+    branch, whatever the layout. If the tree can't be listed (e.g. API rate
+    limit), only the repo-root locations are probed with raw URL checks.
+    """
+    tree = TREE_INDEX.get(owner, repo)
+    if tree and tree.skill_md_paths:
+        paths = sorted(tree.skill_md_paths, key=lambda path: (path.count("/"), path))
+        return [(path, tree.raw_url(path)) for path in paths]
     
-    # Try all patterns for both main and master branches
-    for pattern in patterns_to_try:
-        for branch in ["main", "master"]:
+    found = []
+    branches = branch_cache.candidate_branches(owner, repo)
+    for pattern in ROOT_PATTERNS:
+        for branch in branches:
             url = f"{GITHUB_RAW}/{owner}/{repo}/{branch}/{pattern}"
             try:
-                response = requests.head(url, timeout=5)
+                response = http_client.head(url)
                 if response.status_code == 200:
                     found.append((pattern, url))
+                    break
             except:
                 continue
     
-    # Try common skill-named patterns
-    # For expo/skills, try known skill names
-    known_skills = [
-        "upgrading-expo",
-        "use-dom", 
-        "building-ui",
-        "deployment",
-        "data-fetching",
-        "expo-deployment",
-        "expo-app-design"
-    ]
-    
-    for skill in known_skills:
-        for branch in ["main", "master"]:
-            # Try skills/{skill}/SKILL.md
-            url = f"{GITHUB_RAW}/{owner}/{repo}/{branch}/skills/{skill}/SKILL.md"
-            try:
-                response = requests.head(url, timeout=3)
-                if response.status_code == 200:
-                    found.append((f"skills/{skill}/SKILL.md", url))
-                    continue
-            except:
-                pass
-            
-            # Try plugins/{skill}/skills/{skill}/SKILL.md (expo-style)
-            url = f"{GITHUB_RAW}/{owner}/{repo}/{branch}/plugins/{skill}/skills/{skill}/SKILL.md"
-            try:
-                response = requests.head(url, timeout=3)
-                if response.status_code == 200:
-                    found.append((f"plugins/{skill}/skills/{skill}/SKILL.md", url))
-            except:
-                pass
-    
-    # Try API-based discovery if we haven't found anything and want to be thorough
-    # This may fail due to rate limits but we try anyway
-    if not found:
-        try:
-            response = requests.get(
-                f"{GITHUB_API}/repos/{owner}/{repo}/contents",
-                timeout=10
-            )
-            if response.status_code == 200:
-                contents = response.json()
-                # Search in skills/ and plugins/ directories
-                for item in contents:
-                    if item.get("type") == "dir" and item.get("name") in ["skills", "plugins"]:
-                        dir_name = item.get("name")
-                        try:
-                            dir_response = requests.get(
-                                f"{GITHUB_API}/repos/{owner}/{repo}/contents/{dir_name}",
-                                timeout=10
-                            )
-                            if dir_response.status_code == 200:
-                                dir_contents = dir_response.json()
-                                for subdir in dir_contents:
-                                    if subdir.get("type") == "dir":
-                                        skill_name = subdir.get("name")
-                                        for branch in ["main", "master"]:
-                                            url = f"{GITHUB_RAW}/{owner}/{repo}/{branch}/{dir_name}/{skill_name}/SKILL.md"
-                                            try:
-                                                response = requests.head(url, timeout=3)
-                                                if response.status_code == 200:
-                                                    found.append((f"{dir_name}/{skill_name}/SKILL.md", url))
-                                                    break
-                                            except:
-                                                continue
-                        except:
-                            pass
-        except:
-            pass
-    
     return found
 
 
-def parse_skill_md(content: str) -> dict:
-    """Parse SKILL.md YAML frontmatter"""
-    result = {
-        "name": "",
-        "description": "",
-        "version": "1.0.0",
-        "license": "",
-        "author": ""
-    }
-    
-    if not content.startswith("---"):
-        return result
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return result
-    
-    try:
-        frontmatter = yaml.safe_load(parts[1])
-        if isinstance(frontmatter, dict):
-            result["name"] = frontmatter.get("name", "")
-            result["description"] = frontmatter.get("description", "")
-            result["version"] = frontmatter.get("version", "1.0.0")
-            result["license"] = frontmatter.get("license", "")
-            
-            author = frontmatter.get("author")
-            if isinstance(author, dict):
-                result["author"] = author.get("name", "")
-            elif author:
-                result["author"] = str(author)
-    except yaml.YAMLError:
-        pass
-    
-    return result
-
-
 def validate_skill(input_str: str) -> SkillValidationResult:
     """
     Validate a GitHub skill repository.
@@ -261,7 +181,7 @@ def validate_skill(input_str: str) -> SkillValidationResult:
     
     # Fetch and parse SKILL.md
     try:
-        response = requests.get(skill_url, timeout=10)
+        response = http_client.get(skill_url)
         response.raise_for_status()
         content = response.text
         parsed = parse_skill_md(content)
@@ -274,7 +194,7 @@ def validate_skill(input_str: str) -> SkillValidationResult:
         )
     
     # Extract skill_slug from path
-    skill_slug = parsed["name"]
+    skill_slug = parsed.name
     if not skill_slug:
         # Fallback to directory name
         path_parts = skill_path.split("/")
@@ -290,24 +210,203 @@ def validate_skill(input_str: str) -> SkillValidationResult:
         owner=owner,
         repo=repo,
         skill_slug=skill_slug,
-        skill_name=parsed["name"] or skill_slug,
-        description=parsed["description"],
-        version=parsed["version"],
-        license=parsed["license"],
+        skill_name=parsed.name or skill_slug,
+        description=parsed.description,
+        version=parsed.version,
+        license=parsed.license,
         skill_md_url=skill_url,
         skill_md_path=skill_path
     )
 
 
+def invalid_result(input_str: str, error: str) -> SkillValidationResult:
+    owner, repo = parse_input(input_str)
+    return SkillValidationResult(
+        valid=False, owner=owner, repo=repo, skill_slug="",
+        skill_name="", description="", version="", license="",
+        skill_md_url="", skill_md_path="", error=error
+    )
+
+
+def result_from_dict(data: dict) -> SkillValidationResult:
+    """Inverse of SkillValidationResult.to_dict"""
+    return SkillValidationResult(**{f.name: data.get(f.name, "") for f in fields(SkillValidationResult)})
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP over a Unix domain socket (validate_daemon.py --socket)"""
+
+    def __init__(self, path: str, timeout: float = DAEMON_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def daemon_connection(address: str) -> http.client.HTTPConnection:
+    """Connection to a daemon at http://host:port, host:port or unix:/path"""
+    if address.startswith("unix:"):
+        return UnixHTTPConnection(address[len("unix:"):])
+    url = urlparse(address if "://" in address else f"http://{address}")
+    return http.client.HTTPConnection(url.hostname or "127.0.0.1", url.port or 80, timeout=DAEMON_TIMEOUT)
+
+
+def ask_daemon(address: str, spec: str, find_all: bool = False) -> Optional[dict]:
+    """The daemon's /validate response for a spec, or None if it could not answer"""
+    connection = daemon_connection(address)
+    try:
+        connection.request("GET", "/validate?" + urlencode({"repo": spec, "all": int(find_all)}))
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            return None
+        data = json.loads(body)
+        return data if isinstance(data, dict) and isinstance(data.get("result"), dict) else None
+    except (OSError, http.client.HTTPException, ValueError):
+        return None
+    finally:
+        connection.close()
+
+
+def validate_with_daemon(spec: str, daemon: str = None) -> SkillValidationResult:
+    """validate_skill through the daemon when one is given, locally if it can't answer"""
+    if daemon:
+        response = ask_daemon(daemon, spec)
+        if response:
+            METRICS.inc("daemon_validations")
+            return result_from_dict(response["result"])
+        METRICS.inc("daemon_fallbacks")
+    return validate_skill(spec)
+
+
+def read_specs(source: str) -> Iterator[str]:
+    """Repo specs from a file, or stdin for "-": one per line, blank lines and # comments skipped"""
+    f = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in f:
+            spec = line.strip()
+            if spec and not spec.startswith("#"):
+                yield spec
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def validate_batch(specs: Iterable[str], workers: int = DEFAULT_BATCH_WORKERS,
+                   daemon: str = None) -> Iterator[SkillValidationResult]:
+    """
+    Validate repo specs concurrently, yielding results as they complete.
+    
+    Each owner/repo is validated once even if it is listed several times
+    (or as both a URL and owner/repo). At most workers * IN_FLIGHT_PER_WORKER
+    specs are pending at once, so specs are read only as fast as they finish.
+    With daemon, each spec goes to validate_daemon first (see ask_daemon).
+    """
+    http_client.configure(pool_maxsize=max(http_client.POOL_MAXSIZE, workers))
+    seen = set()
+    
+    def validate_one(spec: str) -> SkillValidationResult:
+        try:
+            return validate_with_daemon(spec, daemon)
+        except Exception as e:
+            return invalid_result(spec, f"Validation failed: {e}")
+        finally:
+            TREE_INDEX.forget(*parse_input(spec))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for spec in specs:
+            owner, repo = parse_input(spec)
+            key = (owner.lower(), repo.lower())
+            if owner and repo:
+                if key in seen:
+                    continue
+                seen.add(key)
+            pending.add(pool.submit(validate_one, spec))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def run_batch(args) -> None:
+    """Batch mode: JSONL results on stdout (or --output), summary on stderr"""
+    start = time.perf_counter()
+    valid = invalid = 0
+    out = JsonlWriter(args.output) if args.output else None
+    try:
+        with METRICS.phase("validate"):
+            for result in validate_batch(read_specs(args.batch), args.workers, args.daemon):
+                if result.valid:
+                    valid += 1
+                else:
+                    invalid += 1
+                if out:
+                    out.write(result.to_dict())
+                else:
+                    print(dumps(result.to_dict()), flush=True)
+    except BaseException:
+        if out:
+            out.abort()
+        raise
+    if out:
+        out.close()
+    
+    elapsed = time.perf_counter() - start
+    total = valid + invalid
+    METRICS.inc("skills_valid", valid)
+    METRICS.inc("skills_invalid", invalid)
+    print(f"Validated {total} repos in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} repos/s): "
+          f"{valid} valid, {invalid} invalid", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate a GitHub skill repository")
-    parser.add_argument("repo", help="Repository in owner/repo format or GitHub URL")
+    parser.add_argument("repo", nargs="?", help="Repository in owner/repo format or GitHub URL")
+    parser.add_argument("--batch", "-b", default=None,
+                       help="File of repo specs to validate, one per line (- for stdin)")
+    parser.add_argument("--workers", "-w", type=int, default=DEFAULT_BATCH_WORKERS,
+                       help="Repos validated in parallel in batch mode")
+    parser.add_argument("--output", "-o", default=None,
+                       help="Batch mode: write JSONL results here instead of stdout")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
     parser.add_argument("--all", "-a", action="store_true", help="Find all SKILL.md files in repo")
+    parser.add_argument("--daemon", "-d", default=None,
+                       help="Ask a running validate_daemon.py first (http://host:port or unix:/path); "
+                            "falls back to validating locally")
+    parser.add_argument("--branch-cache", default=branch_cache.DEFAULT_DB,
+                       help="SQLite file for resolved default branches")
+    parser.add_argument("--repo-cache", default=repo_status.DEFAULT_DB,
+                       help="SQLite file for repo existence checks, shared with the other tools")
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
+    if not args.repo and not args.batch:
+        parser.error("give a repository or --batch FILE")
+    branch_cache.enable(args.branch_cache)
+    repo_status.enable(args.repo_cache)
     
-    result = validate_skill(args.repo)
+    if args.batch:
+        run_batch(args)
+        write_reports(args, job="validate_github_skill")
+        return
+    
+    response = None
+    with METRICS.phase("validate"):
+        if args.daemon:
+            response = ask_daemon(args.daemon, args.repo, args.all)
+            if response is None:
+                METRICS.inc("daemon_fallbacks")
+                print(f"Daemon at {args.daemon} did not answer; validating locally", file=sys.stderr)
+        result = result_from_dict(response["result"]) if response else validate_skill(args.repo)
+    METRICS.inc("skills_valid" if result.valid else "skills_invalid")
     
     if args.json:
         print(json.dumps(result.to_dict(), indent=2))
@@ -327,11 +426,17 @@ def main():
             print(f"✗ Invalid: {result.error}")
     
     if args.all and result.valid:
-        owner, repo = parse_input(args.repo)
-        all_files = find_skill_md(owner, repo)
-        print(f"\nAll SKILL.md files found ({len(all_files)}):")
-        for path, url in all_files:
+        if response and "skill_files" in response:
+            all_paths = response["skill_files"]
+        else:
+            owner, repo = parse_input(args.repo)
+            with METRICS.phase("find_all"):
+                all_paths = [path for path, _ in find_skill_md(owner, repo)]
+        print(f"\nAll SKILL.md files found ({len(all_paths)}):")
+        for path in all_paths:
             print(f"  - {path}")
+    
+    write_reports(args, job="validate_github_skill")
 
 
 if __name__ == "__main__":